@@ -1,10 +1,193 @@
 from django.contrib import admin
-from lms_core.models import Course
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from lms_core import completions, moderation, progress, search, stats, timeline
+from lms_core.models import Comment, ContentCompletion, Course, CourseContent, CourseMember
+
+# Di bawah jumlah ini COUNT(*) masih murah, jadi tetap dihitung tepat
+ESTIMATE_THRESHOLD = 100_000
+
+
+def estimated_count(model):
+    """Perkiraan jumlah baris tabel dari statistik database, tanpa COUNT(*). None kalau tidak tersedia."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                           [model._meta.db_table])
+            row = cursor.fetchone()
+        # -1 kalau tabel belum pernah di-ANALYZE
+        return row[0] if row and row[0] >= 0 else None
+    if connection.vendor == 'sqlite':
+        # Id terbesar lewat index primary key; lebih besar dari jumlah asli kalau ada baris yang dihapus
+        return model._default_manager.aggregate(last=Max('pk'))['last'] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator changelist yang tidak menjalankan COUNT(*) di tabel besar tanpa filter.
+
+    Jumlah halaman jadi perkiraan; halaman terakhir bisa saja kosong.
+    Kalau ada filter atau pencarian, jumlah dihitung tepat seperti biasa.
+    """
+
+    @cached_property
+    def count(self):
+        if not self.object_list.query.where:
+            estimate = estimated_count(self.object_list.model)
+            if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Tanpa COUNT(*) kedua untuk "x dari total" di atas changelist
+    show_full_result_count = False
+
+
+def course_ids(queryset, field):
+    return list(queryset.order_by().values_list(field, flat=True).distinct())
+
+
+def raw_delete(queryset):
+    """Satu DELETE langsung tanpa signal dan tanpa cascade Django; counter harus dihitung ulang sendiri."""
+    queryset = queryset.order_by().select_related(None)
+    return queryset._raw_delete(queryset.db)
+
+
+def refresh_stats(ids):
+    if ids:
+        stats.rebuild(Course.objects.filter(pk__in=ids))
+
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(ScalableAdmin):
     list_display = ["name", "price", "description", "teacher", 'created_at']
-    list_filter = ["teacher"]
+    list_select_related = ["teacher"]
+    # Hanya user yang memang mengajar, bukan semua user
+    list_filter = [("teacher", admin.RelatedOnlyFieldListFilter)]
     search_fields = ["name", "description"]
+    autocomplete_fields = ["teacher"]
+    readonly_fields = ["created_at", "updated_at"]
+    fields = ["name", "description", "price", "image", "teacher", "created_at", "updated_at"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Lewat index full-text (lms_core.search), bukan icontains ke name/description
+        if not search_term.strip() or not search.available():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=search.matching_ids('course', search_term)), False
+
+
+@admin.register(CourseMember)
+class CourseMemberAdmin(ScalableAdmin):
+    list_display = ["id", "course", "user", "roles", "created_at"]
+    list_select_related = ["course", "user"]
+    list_filter = ["roles"]
+    # Username dicocokkan persis supaya memakai index, bukan LIKE di tabel user
+    search_fields = ["=user__username"]
+    autocomplete_fields = ["course"]
+    raw_id_fields = ["user"]
     readonly_fields = ["created_at", "updated_at"]
-    fields = ["name", "description", "price", "image", "teacher", "created_at", "updated_at"]
\ No newline at end of file
+    actions = ["delete_members"]
+
+    @admin.action(description="Hapus peserta terpilih beserta komentarnya (langsung)", permissions=["delete"])
+    def delete_members(self, request, queryset):
+        with transaction.atomic():
+            comments = Comment.objects.filter(member_id__in=queryset.order_by().values('pk'))
+            # Komentar dihitung di course kontennya, yang belum tentu course peserta
+            courses = set(course_ids(queryset, 'course')) | set(course_ids(comments, 'content_id__course'))
+            raw_delete(comments)
+            deleted = raw_delete(queryset)
+            refresh_stats(courses)
+        self.message_user(request, f"{deleted} peserta dihapus")
+
+
+@admin.register(CourseContent)
+class CourseContentAdmin(ScalableAdmin):
+    list_display = ["id", "name", "course", "parent_id", "release_time"]
+    list_select_related = ["course"]
+    search_fields = ["name", "description"]
+    autocomplete_fields = ["course"]
+    raw_id_fields = ["parent_id"]
+    readonly_fields = ["path", "created_at", "updated_at"]
+    actions = ["release_now"]
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip() or not search.available():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=search.matching_ids('content', search_term)), False
+
+    @admin.action(description="Rilis konten terpilih sekarang", permissions=["change"])
+    def release_now(self, request, queryset):
+        now = timezone.now()
+        with transaction.atomic():
+            pending = queryset.filter(release_time__gt=now)
+            ids = list(pending.values_list('pk', flat=True))
+            released = CourseContent.objects.filter(pk__in=ids).update(release_time=now)
+            # UPDATE tidak memicu signal
+            search.index_queryset('content', CourseContent.objects.filter(pk__in=ids))
+            transaction.on_commit(timeline.invalidate)
+        self.message_user(request, f"{released} konten dirilis")
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableAdmin):
+    list_display = ["id", "member_id", "content_id", "is_approved", "is_rejected", "claimed_by", "created_at"]
+    # __str__ CourseMember dan CourseContent hanya memakai kolom FK, jadi cukup dua join ini
+    list_select_related = ["member_id", "content_id", "claimed_by"]
+    list_filter = ["is_approved", "is_rejected"]
+    raw_id_fields = ["member_id", "content_id"]
+    readonly_fields = ["claimed_by", "claimed_at", "created_at", "updated_at"]
+    actions = ["approve", "reject", "unapprove", "delete_comments"]
+
+    @admin.action(description="Setujui komentar terpilih", permissions=["change"])
+    def approve(self, request, queryset):
+        self.message_user(request, f"{len(moderation.approve(queryset))} komentar disetujui")
+
+    @admin.action(description="Tolak komentar terpilih", permissions=["change"])
+    def reject(self, request, queryset):
+        self.message_user(request, f"{len(moderation.reject(queryset))} komentar ditolak")
+
+    @admin.action(description="Kembalikan komentar terpilih ke antrean moderasi", permissions=["change"])
+    def unapprove(self, request, queryset):
+        with transaction.atomic():
+            changed = queryset.exclude(is_approved=False, is_rejected=False)
+            courses = course_ids(changed.filter(is_approved=True), 'content_id__course')
+            updated = Comment.objects.filter(pk__in=changed.order_by().values('pk')).update(
+                is_approved=False, is_rejected=False)
+            refresh_stats(courses)
+        self.message_user(request, f"{updated} komentar dikembalikan ke antrean")
+
+    @admin.action(description="Hapus komentar terpilih (langsung)", permissions=["delete"])
+    def delete_comments(self, request, queryset):
+        with transaction.atomic():
+            courses = course_ids(queryset, 'content_id__course')
+            deleted = raw_delete(queryset)
+            refresh_stats(courses)
+        self.message_user(request, f"{deleted} komentar dihapus")
+
+
+@admin.register(ContentCompletion)
+class ContentCompletionAdmin(ScalableAdmin):
+    list_display = ["id", "user", "content", "completed_at"]
+    list_select_related = ["user", "content"]
+    raw_id_fields = ["user", "content"]
+    readonly_fields = ["completed_at"]
+    actions = ["delete_completions"]
+
+    @admin.action(description="Hapus completion terpilih (langsung)", permissions=["delete"])
+    def delete_completions(self, request, queryset):
+        with transaction.atomic():
+            courses = course_ids(queryset, 'content__course')
+            users = list(queryset.order_by().values_list('user_id', flat=True).distinct())
+            # DELETE langsung tidak memicu signal, jadi tombstone untuk sync klien dicatat di sini
+            completions.record_deletions(queryset.order_by().values_list('user_id', 'content_id').iterator())
+            deleted = raw_delete(queryset)
+            refresh_stats(courses)
+            progress.rebuild(users)
+        self.message_user(request, f"{deleted} completion dihapus")
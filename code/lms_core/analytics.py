@@ -0,0 +1,64 @@
+import time
+
+from django.core.cache import cache
+
+from lms_core import stats
+from lms_core.models import Course
+
+CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(course_id):
+    return f"course:{course_id}:analytics:version"
+
+
+def _fresh_version():
+    # Bukan mulai dari 1 lagi, supaya entri lama tidak pernah cocok setelah versi hilang dari cache
+    return time.time_ns()
+
+
+def course_version(course_id):
+    key = _version_key(course_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(course_id):
+    """Naikkan versi analytics course; entri cache lama otomatis tidak terpakai."""
+    key = _version_key(course_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _fresh_version(), None)
+
+
+def compute(course_id):
+    row = (Course.objects.filter(pk=course_id).annotate(**stats.counter_annotations())
+           .values('name', *stats.COUNTERS).first())
+    if row is None:
+        return None
+    contents, comments = row['contents'], row['comments']
+    return {
+        "course_name": row['name'],
+        "total_students": row['students'],
+        "total_contents": contents,
+        "total_comments": comments,
+        "approved_comments": row['approved_comments'],
+        "total_completions": row['completions'],
+        # Optional: Rata-rata komentar per konten
+        "avg_comments_per_content": round(comments / contents, 2) if contents > 0 else 0,
+    }
+
+
+def course_analytics(course_id):
+    """Analytics satu course: satu query saat cache kosong, nol query saat cache hangat."""
+    key = f"course:{course_id}:analytics:v{course_version(course_id)}"
+    data = cache.get(key)
+    if data is None:
+        data = compute(course_id)
+        if data is not None:
+            cache.set(key, data, CACHE_TIMEOUT)
+    return data
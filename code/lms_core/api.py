@@ -1,12 +1,17 @@
-from ninja import NinjaAPI, UploadedFile, File, Form
+from ninja import NinjaAPI, Router, UploadedFile, File, Form
+from ninja.errors import HttpError
 from ninja.responses import Response
 from lms_core.schema import CourseSchemaOut, CourseMemberOut, CourseSchemaIn
 from lms_core.schema import CourseContentMini, CourseContentFull
-from lms_core.schema import CourseCommentOut, CourseCommentIn
+from lms_core.schema import CourseCommentOut, CourseCommentIn, CommentItemOut
+from lms_core.pagination import KeysetPagination
+from lms_core.planner import optimize
 from lms_core.models import Course, CourseMember, CourseContent, Comment
+from lms_core import moderation
 from ninja_simple_jwt.auth.views.api import mobile_auth_router
 from ninja_simple_jwt.auth.ninja_auth import HttpJwtAuth
 from ninja.pagination import paginate, PageNumberPagination
+from typing import List
 
 from django.contrib.auth.models import User
 
@@ -14,3 +19,23 @@ apiv1 = NinjaAPI()
 apiv1.add_router("/auth/", mobile_auth_router)
 apiAuth = HttpJwtAuth()
 
+
+comments_router = Router(tags=["comments"])
+
+
+@comments_router.get("/content/{content_id}", response=List[CommentItemOut])
+@paginate(KeysetPagination)
+def list_content_comments(request, content_id: int):
+    return optimize(moderation.approved(content_id), CommentItemOut)
+
+
+@comments_router.get("/pending", auth=apiAuth, response=List[CommentItemOut])
+@paginate(KeysetPagination)
+def list_pending_comments(request):
+    # Klaim token tidak membawa is_staff, jadi cek ke database
+    if not User.objects.filter(pk=request.user.id, is_staff=True).exists():
+        raise HttpError(403, "Hanya admin yang boleh melihat komentar pending")
+    return optimize(moderation.pending(), CommentItemOut)
+
+
+apiv1.add_router("/comments/", comments_router)
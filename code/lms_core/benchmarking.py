@@ -0,0 +1,46 @@
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from lms_core.models import Course
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Jalankan blok di dalam transaksi yang selalu di-rollback, jadi data contoh tidak tertinggal."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(repeat, fn):
+    """Waktu terbaik (detik) dari ``repeat`` kali menjalankan ``fn``."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def seed_course(**fields):
+    """
+    Buat course contoh dengan nama unik ``bench-xxxxxxxx``.
+
+    Pengajarnya user baru dengan username yang sama dengan nama course,
+    jadi data contoh bisa dibersihkan lewat prefix itu.
+    """
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    teacher = User.objects.create(username=prefix)
+    return Course.objects.create(**{'name': prefix, 'description': "-", 'price': 0, 'teacher': teacher, **fields})
@@ -0,0 +1,230 @@
+import hashlib
+import io
+import os
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from reportlab.graphics import renderPDF
+from reportlab.graphics.barcode import qr
+from reportlab.graphics.shapes import Drawing, Rect, String
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from lms_core.pools import imap_ordered
+
+# Naikkan setiap kali tampilan sertifikat berubah supaya cache lama tidak dipakai
+TEMPLATE_VERSION = 1
+
+LOGO_PATH = os.path.join('static', 'image.png')
+VERIFY_URL = 'https://udinus.ac.id/verify/123456'
+
+
+def cache_dir():
+    return Path(getattr(settings, 'CERTIFICATE_CACHE_DIR', settings.BASE_DIR / 'cache' / 'certificates'))
+
+
+@lru_cache(maxsize=1)
+def logo():
+    # Logo Udinus (ganti path lokal gambar sesuai lokasi logo kamu)
+    return ImageReader(LOGO_PATH) if os.path.exists(LOGO_PATH) else None
+
+
+@lru_cache(maxsize=1)
+def qr_drawing():
+    qr_code = qr.QrCodeWidget(VERIFY_URL)
+    x1, y1, x2, y2 = qr_code.getBounds()
+    drawing = Drawing(x2 - x1, y2 - y1)
+    drawing.add(qr_code)
+    return drawing
+
+
+@lru_cache(maxsize=256)
+def static_layer(course_name, course_description, version=TEMPLATE_VERSION):
+    """
+    Bagian sertifikat yang sama untuk semua peserta satu course.
+
+    Dibangun sekali per course (dan versi template); lihat
+    ``static_layer_code`` untuk bentuk yang dipakai ulang di setiap PDF.
+    """
+    width, height = A4
+    layer = Drawing(width, height)
+
+    # Border emas
+    layer.add(Rect(40, 40, width - 80, height - 80, strokeColor=colors.gold, strokeWidth=5, fillColor=None))
+
+    # Judul
+    layer.add(String(width / 2, height - 170, "SERTIFIKAT PENYELESAIAN", textAnchor='middle',
+                     fontName="Helvetica-Bold", fontSize=28, fillColor=colors.darkblue))
+
+    # Konten utama
+    texts = [
+        (height - 210, "Dengan ini menyatakan bahwa", "Helvetica", 14),
+        (height - 270, "telah berhasil menyelesaikan kursus:", "Helvetica", 14),
+        (height - 300, course_name, "Helvetica-Bold", 18),
+        (height - 320, course_description, "Helvetica-Oblique", 12),
+    ]
+    for y, text, font, size in texts:
+        layer.add(String(width / 2, y, text, textAnchor='middle', fontName=font, fontSize=size,
+                         fillColor=colors.black))
+
+    # Tanda tangan
+    layer.add(String(60, 100, "Admin LMS", fontName="Helvetica", fontSize=12, fillColor=colors.black))
+    layer.add(String(60, 80, "(AKMAL ZULFIKAR)", fontName="Helvetica", fontSize=12, fillColor=colors.black))
+    return layer
+
+
+def _draw_static(p, course_name, course_description, version=TEMPLATE_VERSION):
+    renderPDF.draw(static_layer(course_name, course_description, version), p, 0, 0)
+    renderPDF.draw(qr_drawing(), p, 420, 70)
+
+
+@lru_cache(maxsize=256)
+def static_layer_code(course_name, course_description, version=TEMPLATE_VERSION):
+    """
+    Operator PDF ``static_layer``, dirender sekali per course lalu disalin ke setiap PDF.
+
+    QR code ikut di sini karena URL-nya sama untuk semua peserta dan
+    widget-nya meng-encode ulang setiap kali digambar. Form XObject
+    reportlab terikat ke satu dokumen, jadi yang disimpan adalah isi
+    stream-nya. Nama font internal (/F1, /F2, ...) ditentukan urutan
+    pemakaian font di dokumen, jadi ikut disimpan. ``_code`` dan
+    ``fontMapping`` bukan API publik reportlab: versinya dipin di
+    requirements.txt dan hasilnya dicek oleh CertificateRenderTests.
+    """
+    p = canvas.Canvas(io.BytesIO(), pagesize=A4)
+    start = len(p._code)
+    _draw_static(p, course_name, course_description, version)
+    return tuple(p._code[start:]), tuple(p._doc.fontMapping.items())
+
+
+def draw_static_layer(p, course_name, course_description):
+    code, fonts = static_layer_code(course_name, course_description)
+    # Daftarkan font dengan urutan yang sama supaya nama di operator cache cocok dengan dokumen ini
+    if [p._doc.getInternalFontName(font) for font, _ in fonts] == [name for _, name in fonts]:
+        p._code.extend(code)
+    else:
+        _draw_static(p, course_name, course_description)
+
+
+def render_certificate(username, course_name, course_description, issued_on):
+    """Render sertifikat menjadi bytes PDF. Hanya menerima data biasa agar bisa dipanggil dari proses lain."""
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+
+    p.beginForm('static')
+    image = logo()
+    if image is not None:
+        p.drawImage(image, width / 2 - 50, height - 130, width=80, height=80, mask='auto')
+    draw_static_layer(p, course_name, course_description)
+    p.endForm()
+    p.doForm('static')
+
+    # Bagian per peserta
+    p.setFillColor(colors.black)
+    p.setFont("Helvetica-Bold", 22)
+    p.drawCentredString(width / 2, height - 240, username)
+
+    # Tanggal
+    p.setFont("Helvetica", 12)
+    p.drawRightString(width - 60, 165, f"Semarang, {issued_on}")
+
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def issue_date(day=None):
+    """Tanggal terbit seperti yang dicetak di sertifikat (default hari ini)."""
+    return (day or timezone.localdate()).strftime('%d %B %Y')
+
+
+def certificate_key(user, course, issued_on):
+    # Tanggal terbit ikut tercetak, jadi bagian dari kunci
+    raw = (f"{TEMPLATE_VERSION}:{user.pk}:{user.username}:{course.pk}:{course.name}:{course.description}:"
+           f"{issued_on}")
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def cache_path(key):
+    return cache_dir() / key[:2] / f"{key}.pdf"
+
+
+def store_certificate(key, pdf):
+    path = cache_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(pdf)
+    os.replace(tmp_path, path)
+    return path
+
+
+def render_to_cache(key, username, course_name, course_description, issued_on):
+    path = cache_path(key)
+    if not path.exists():
+        pdf = render_certificate(username, course_name, course_description, issued_on)
+        path = store_certificate(key, pdf)
+    return path
+
+
+def get_certificate(user, course, issued_on):
+    """Ambil sertifikat dari cache disk, render dulu kalau belum ada. Mengembalikan (key, path)."""
+    key = certificate_key(user, course, issued_on)
+    return key, render_to_cache(key, user.username, course.name, course.description, issued_on)
+
+
+def _cached_or_render(job):
+    # Dijalankan di worker pool: baca dari cache disk atau render lalu simpan
+    key, username, course_name, course_description, issued_on = job
+    path = cache_path(key)
+    if path.exists():
+        pdf = path.read_bytes()
+    else:
+        pdf = render_certificate(username, course_name, course_description, issued_on)
+        store_certificate(key, pdf)
+    return f"sertifikat_{username}.pdf", pdf
+
+
+def iter_course_certificates(course, issued_on, workers=None):
+    """Yield (nama file, bytes PDF) untuk setiap peserta course, dirender paralel di process pool."""
+    users = (User.objects.filter(coursemember__course=course).distinct()
+             .only('id', 'username').order_by('id').iterator(chunk_size=500))
+    jobs = ((certificate_key(user, course, issued_on), user.username, course.name, course.description, issued_on)
+            for user in users)
+    return imap_ordered(_cached_or_render, jobs, workers)
+
+
+class _ZipSink:
+    """Target tulis ZipFile yang tidak bisa seek; isinya diambil per potong lewat pop()."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(files):
+    """Bungkus (nama, bytes) menjadi ZIP yang dikirim per file, tanpa menahan seluruh arsip di memori."""
+    sink = _ZipSink()
+    # PDF sudah terkompresi, jadi disimpan apa adanya
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for name, data in files:
+            archive.writestr(name, data)
+            yield sink.pop()
+    yield sink.pop()
@@ -0,0 +1,127 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from lms_core import progress, stats
+from lms_core.models import CompletionTombstone, ContentCompletion, CourseContent
+from lms_core.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def bulk_complete(user, content_ids):
+    """
+    Tandai banyak konten selesai untuk ``user`` dengan satu ``bulk_create``.
+
+    Konten yang ada dicek dengan satu query, completion baru dimasukkan
+    dengan ``ignore_conflicts``, lalu CourseStats dan CourseProgress semua
+    course yang tersentuh diperbarui sekaligus (bulk_create tidak memicu
+    signal). Mengembalikan dict ``{content_id: status}`` dengan status
+    ``completed``, ``already_completed`` atau ``not_found``.
+    """
+    ids = list(dict.fromkeys(content_ids))
+    with transaction.atomic():
+        courses = dict(CourseContent.objects.filter(pk__in=ids).values_list('pk', 'course_id'))
+        already = set(ContentCompletion.objects.filter(user=user, content_id__in=courses)
+                      .values_list('content_id', flat=True))
+        new = [ContentCompletion(user=user, content_id=pk) for pk in courses if pk not in already]
+        ContentCompletion.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+        # ignore_conflicts tidak mengembalikan pk; baris milik request ini dikenali dari completed_at-nya
+        stamps = {completion.content_id: completion.completed_at for completion in new}
+        rows = ContentCompletion.objects.filter(user=user, content_id__in=stamps).values_list(
+            'content_id', 'completed_at')
+        created = {pk for pk, completed_at in rows if completed_at == stamps[pk]}
+        if created:
+            totals = Counter(courses[pk] for pk in created)
+            stats.bump_many('completions', totals)
+            progress.refresh(user.pk, list(totals))
+
+    outcomes = {}
+    for pk in ids:
+        if pk not in courses:
+            outcomes[pk] = 'not_found'
+        else:
+            outcomes[pk] = 'completed' if pk in created else 'already_completed'
+    return outcomes
+
+
+def sync_horizon():
+    # completed_at/deleted_at diisi sebelum commit, jadi transaksi yang commit belakangan bisa
+    # membawa waktu yang lebih kecil dari baris yang sudah terkirim; baris terbaru ditahan dulu
+    return timezone.now() - timedelta(seconds=getattr(settings, 'COMPLETION_SYNC_LAG', 5))
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, 'COMPLETION_TOMBSTONE_DAYS', 30))
+
+
+def record_deletions(pairs):
+    """Catat tombstone untuk pasangan ``(user_id, content_id)`` completion yang dihapus."""
+    now = timezone.now()
+    CompletionTombstone.objects.bulk_create(
+        [CompletionTombstone(user_id=user_id, content_id=content_id, deleted_at=now) for user_id, content_id in pairs],
+        batch_size=1000)
+
+
+def prune_tombstones():
+    """Hapus tombstone yang lebih tua dari ``COMPLETION_TOMBSTONE_DAYS``. Mengembalikan jumlahnya."""
+    return CompletionTombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()[0]
+
+
+def completed_by(user):
+    """Semua completion ``user``."""
+    return ContentCompletion.objects.filter(user=user)
+
+
+def changes(user, since=None, horizon=None):
+    """Completion ``user`` yang tercatat setelah ``since`` dan sebelum ``horizon`` (default ``sync_horizon()``)."""
+    completions = completed_by(user).filter(completed_at__lte=horizon or sync_horizon())
+    if since is not None:
+        completions = completions.filter(completed_at__gt=since)
+    return completions
+
+
+def tombstones(user, lower, upper):
+    """Tombstone ``user`` dengan ``lower < deleted_at <= upper``, urut (deleted_at, id)."""
+    return CompletionTombstone.objects.filter(user=user, deleted_at__gt=lower, deleted_at__lte=upper).order_by(
+        'deleted_at', 'id')
+
+
+def changes_page(user, since=None, cursor=None, page_size=None):
+    """
+    Satu halaman sync inkremental completion ``user`` sejak ``cursor`` (atau ``since``).
+
+    Completion baru dipaging dengan keyset (completed_at, id). Tombstone
+    completion yang dihapus dikirim untuk rentang waktu yang sama dengan
+    halaman itu, jadi setiap penghapusan terkirim tepat satu kali; klien
+    menerapkan ``deleted`` lebih dulu, baru ``results``. Kalau titik
+    sync lebih tua dari masa simpan tombstone, ``resync`` bernilai True
+    dan klien harus sync ulang dari awal.
+
+    Mengembalikan dict ``results``, ``deleted``, ``next_cursor``,
+    ``sync_cursor`` dan ``resync``. Bisa melempar ``InvalidCursor``.
+    """
+    horizon = sync_horizon()
+    lower = decode_cursor(cursor)[0] if cursor else since
+    items, next_cursor = keyset_page(changes(user, None if cursor else since, horizon), cursor, page_size,
+                                     key='completed_at')
+    if next_cursor:
+        upper, sync_cursor = items[-1].completed_at, next_cursor
+    else:
+        # Semua completion sampai horizon sudah terkirim, jadi titik sync maju ke horizon
+        last_pk = items[-1].pk if items and items[-1].completed_at == horizon else 0
+        upper, sync_cursor = horizon, encode_cursor(horizon, last_pk)
+
+    deleted, resync = [], False
+    # Klien tanpa titik sync belum punya data lokal yang perlu dihapus
+    if lower is not None:
+        resync = lower < timezone.now() - tombstone_retention()
+        deleted = list(tombstones(user, lower, upper).values('content_id', 'deleted_at'))
+    return {
+        'results': items,
+        'deleted': deleted,
+        'next_cursor': next_cursor,
+        'sync_cursor': sync_cursor,
+        'resync': resync,
+    }
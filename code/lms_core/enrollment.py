@@ -0,0 +1,124 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from lms_core import analytics, stats
+from lms_core.models import CourseMember, CourseStats
+
+
+class EnrollmentError(Exception):
+    pass
+
+
+class AlreadyEnrolled(EnrollmentError):
+    pass
+
+
+class CourseFull(EnrollmentError):
+    pass
+
+
+def members(course, users):
+    """Keanggotaan ``users`` di ``course``."""
+    return CourseMember.objects.filter(course=course, user__in=users)
+
+
+def claim_seats(course, count=1):
+    """
+    Ambil ``count`` kursi course dengan satu UPDATE bersyarat.
+
+    ``students = students + count WHERE students <= max - count`` dievaluasi
+    ulang oleh database setelah baris dikunci, jadi request paralel tidak
+    bisa melewati kuota. Dipanggil di dalam transaksi sebelum member
+    disimpan: baris CourseStats tetap terkunci sampai commit, sehingga
+    pendaftaran lain ke course yang sama menunggu.
+    """
+    seats = CourseStats.objects.filter(course_id=course.pk, students__lte=course.max_participants - count)
+    if seats.update(students=F('students') + count):
+        return True
+    if not CourseStats.objects.filter(course_id=course.pk).exists():
+        stats.rebuild(type(course).objects.filter(pk=course.pk))
+        return bool(seats.update(students=F('students') + count))
+    return False
+
+
+def enroll(user, course, roles='std'):
+    with transaction.atomic():
+        # Kursi diklaim sebelum insert, urutan kunci sama dengan bulk_enroll; kalau insert gagal
+        # klaimnya ikut di-rollback
+        if not claim_seats(course):
+            if members(course, [user]).exists():
+                raise AlreadyEnrolled("User sudah terdaftar di course ini.")
+            raise CourseFull("Kuota peserta untuk course ini sudah penuh.")
+        member = CourseMember(user=user, course=course, roles=roles)
+        # Counter students sudah dinaikkan di sini, signal tidak perlu bump lagi
+        member._seat_claimed = True
+        try:
+            with transaction.atomic():
+                member.save()
+        except IntegrityError:
+            raise AlreadyEnrolled("User sudah terdaftar di course ini.")
+    return member
+
+
+class _Conflict(Exception):
+    # Kursi atau member berubah di antara pengecekan dan insert; transaksi diulang
+    pass
+
+
+def bulk_enroll(course, users, roles='std', attempts=3):
+    """
+    Daftarkan banyak user sekaligus ke ``course``.
+
+    Baris CourseStats dikunci lebih dulu, lalu member yang sudah ada dan
+    sisa kuota dicek sekali untuk seluruh daftar; kursi diklaim dengan satu
+    UPDATE bersyarat dan peserta baru dimasukkan dengan satu
+    ``bulk_create``. Selama kunci dipegang tidak ada pendaftaran lain ke
+    course ini, jadi semua baris yang dimasukkan memang baru. Mengembalikan dict
+    ``{user_id: status}`` dengan status ``enrolled``, ``already_enrolled``
+    atau ``course_full``.
+    """
+    users = list({user.pk: user for user in users}.values())
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                outcomes = _bulk_enroll(course, users, roles)
+            break
+        except _Conflict:
+            if attempt == attempts - 1:
+                raise CourseFull("Kuota peserta untuk course ini sudah penuh.")
+    analytics.invalidate(course.pk)
+    return outcomes
+
+
+def _locked_students(course):
+    rows = CourseStats.objects.select_for_update().filter(course_id=course.pk).values_list('students', flat=True)
+    seats = rows.first()
+    if seats is None:
+        stats.rebuild(type(course).objects.filter(pk=course.pk))
+        seats = rows.first()
+    return seats
+
+
+def _bulk_enroll(course, users, roles):
+    free = max(course.max_participants - _locked_students(course), 0)
+    already = set(members(course, users).values_list('user_id', flat=True))
+
+    outcomes = {user.pk: 'already_enrolled' for user in users if user.pk in already}
+    candidates = [user for user in users if user.pk not in already]
+    admitted, rejected = candidates[:free], candidates[free:]
+    outcomes.update((user.pk, 'course_full') for user in rejected)
+    if not admitted:
+        return outcomes
+
+    # Tanpa row lock (SQLite) counter bisa berubah setelah dibaca; UPDATE bersyarat tetap menjaga kuota
+    if not claim_seats(course, len(admitted)):
+        raise _Conflict
+    try:
+        with transaction.atomic():
+            CourseMember.objects.bulk_create(
+                [CourseMember(course=course, user=user, roles=roles) for user in admitted], batch_size=1000)
+    except IntegrityError:
+        # Member dibuat lewat jalur yang tidak mengunci CourseStats (admin, import)
+        raise _Conflict
+    outcomes.update((user.pk, 'enrolled') for user in admitted)
+    return outcomes
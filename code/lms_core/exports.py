@@ -0,0 +1,71 @@
+import csv
+import json
+
+from lms_core.models import Comment, ContentCompletion
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+FIELDS = ['type', 'user_id', 'username', 'content_id', 'content_name', 'timestamp', 'comment', 'is_approved']
+
+CHUNK_SIZE = 2000
+
+
+def course_records(course_id, chunk_size=CHUNK_SIZE):
+    """
+    Yield tuple sesuai ``FIELDS`` untuk semua completion lalu komentar satu course.
+
+    Keduanya dibaca dengan ``values_list().iterator()`` (server-side cursor
+    di Postgres), jadi tidak ada instance model dan hanya satu chunk yang
+    ada di memori.
+    """
+    completions = (ContentCompletion.objects.filter(content__course_id=course_id).order_by()
+                   .values_list('user_id', 'user__username', 'content_id', 'content__name', 'completed_at'))
+    for user_id, username, content_id, content_name, completed_at in completions.iterator(chunk_size=chunk_size):
+        yield 'completion', user_id, username, content_id, content_name, completed_at.isoformat(), None, None
+
+    comments = (Comment.objects.filter(content_id__course_id=course_id).order_by()
+                .values_list('member_id__user_id', 'member_id__user__username', 'content_id', 'content_id__name',
+                             'created_at', 'comment', 'is_approved'))
+    for user_id, username, content_id, content_name, created_at, comment, is_approved in comments.iterator(
+            chunk_size=chunk_size):
+        yield 'comment', user_id, username, content_id, content_name, created_at.isoformat(), comment, is_approved
+
+
+class _Echo:
+    """File palsu untuk csv.writer: write() langsung mengembalikan barisnya."""
+
+    def write(self, value):
+        return value
+
+
+def _batched(lines, size):
+    # Kirim beberapa baris sekaligus; satu chunk HTTP per baris terlalu boros
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield ''.join(batch)
+            batch = []
+    if batch:
+        yield ''.join(batch)
+
+
+def stream_ndjson(records, batch_size=500):
+    return _batched((json.dumps(dict(zip(FIELDS, record)), ensure_ascii=False) + '\n' for record in records),
+                    batch_size)
+
+
+def stream_csv(records, batch_size=500):
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(FIELDS)
+        for record in records:
+            yield writer.writerow(record)
+    return _batched(lines(), batch_size)
+
+
+STREAMS = {'ndjson': stream_ndjson, 'csv': stream_csv}
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import fields as drf_fields
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+# Field DRF yang nilainya dari .values() sudah bertipe sama dengan outputnya
+PASSTHROUGH = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.FloatField, serializers.ChoiceField, serializers.PrimaryKeyRelatedField,
+)
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None:
+        return None
+    if output_format.lower() != drf_fields.ISO_8601:
+        return field.to_representation
+
+    def convert(value, tz):
+        if tz is not None:
+            value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+        value = value.isoformat()
+        # Sama dengan DRF: UTC ditulis dengan akhiran Z
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _file_converter(field, model_field):
+    if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+        return lambda name, request: name or None
+    storage = model_field.storage
+
+    def convert(name, request):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+class ValuesSerializer:
+    """
+    Versi read-only sebuah ``ModelSerializer`` yang bekerja di atas ``values_list()``.
+
+    Field serializer dipetakan sekali ke kolom model beserta konverternya
+    (datetime ke ISO 8601 seperti DRF, FileField ke URL storage, sisanya
+    ``to_representation`` field DRF); saat serialize tidak ada instance
+    model yang dibuat. Field nested, method field dan source bertitik
+    tidak didukung.
+    """
+
+    def __init__(self, serializer_class):
+        serializer = serializer_class()
+        model = serializer_class.Meta.model
+        self.names, self.sources = [], []
+        self.converters = []  # (posisi, jenis, fungsi)
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.BaseSerializer) or field.source == '*' or '.' in field.source:
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name} tidak bisa dibaca dari values()")
+            model_field = model._meta.get_field(field.source)
+            position = len(self.names)
+            self.names.append(name)
+            self.sources.append(field.source)
+            if isinstance(field, serializers.DateTimeField):
+                convert = _datetime_converter(field)
+                if convert is not None:
+                    kind = 'datetime' if convert is not field.to_representation else 'plain'
+                    self.converters.append((position, kind, convert))
+            elif isinstance(field, serializers.FileField):
+                self.converters.append((position, 'file', _file_converter(field, model_field)))
+            elif not isinstance(field, PASSTHROUGH):
+                self.converters.append((position, 'plain', field.to_representation))
+
+    def serialize(self, queryset, request=None):
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        converters = []
+        for position, kind, convert in self.converters:
+            if kind == 'datetime':
+                converters.append((position, lambda value, convert=convert: convert(value, tz)))
+            elif kind == 'file':
+                converters.append((position, lambda value, convert=convert: convert(value, request)))
+            else:
+                converters.append((position, convert))
+
+        names = self.names
+        rows = queryset.values_list(*self.sources)
+        if not converters:
+            return [dict(zip(names, row)) for row in rows]
+
+        data = []
+        for row in rows:
+            row = list(row)
+            for position, convert in converters:
+                value = row[position]
+                if value is not None:
+                    row[position] = convert(value)
+            data.append(dict(zip(names, row)))
+        return data
+
+
+@lru_cache(maxsize=None)
+def values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
@@ -0,0 +1,41 @@
+import math
+from itertools import chain, islice
+
+from django.contrib.auth.hashers import make_password
+
+from lms_core.pools import imap_ordered, worker_count
+
+# Di bawah jumlah ini overhead kirim ke proses lain lebih mahal dari hash-nya
+INLINE_THRESHOLD = 4
+
+
+def _hash_batch(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def imap_passwords(passwords, workers=None, batch_size=32):
+    """
+    Hash password secara paralel dan yield hasilnya sesuai urutan input.
+
+    Password dikirim ke process pool per batch paling banyak ``batch_size``
+    sehingga input bisa berupa generator panjang; input yang tidak cukup
+    untuk satu batch penuh per worker dibagi rata ke semua worker.
+    ``workers=0`` menghash di proses ini, begitu juga kalau jumlah password
+    di bawah ``INLINE_THRESHOLD``.
+    """
+    workers = worker_count(workers)
+    iterator = iter(passwords)
+    # Intip sampai satu batch penuh per worker supaya ukuran batch input pendek bisa dihitung
+    head = list(islice(iterator, max(workers, 1) * batch_size))
+    if len(head) < INLINE_THRESHOLD:
+        workers = 0
+    elif len(head) < workers * batch_size:
+        batch_size = math.ceil(len(head) / workers)
+    iterator = chain(head, iterator)
+    batches = iter(lambda: list(islice(iterator, batch_size)), [])
+    for hashed in imap_ordered(_hash_batch, batches, workers):
+        yield from hashed
+
+
+def hash_passwords(passwords, workers=None, batch_size=32):
+    return list(imap_passwords(passwords, workers, batch_size))
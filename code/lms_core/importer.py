@@ -0,0 +1,441 @@
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice, tee
+
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from lms_core import search, timeline
+from lms_core import stats as course_stats
+from lms_core.hashing import imap_passwords
+from lms_core.jsonstream import iter_json_array
+from lms_core.models import Course, CourseMember, CourseContent, Comment, content_path
+
+ENTITIES = ['users', 'courses', 'members', 'contents', 'comments']
+BACKENDS = ['orm', 'copy']
+
+
+@dataclass
+class ImportStats:
+    entity: str
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+    @property
+    def written(self):
+        return self.created + self.updated
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (f"{self.entity}: {self.created} created, {self.updated} updated, {self.skipped} skipped, "
+                f"{self.rows} rows in {self.seconds:.2f}s ({self.rows_per_sec:.0f} rows/sec)")
+
+
+class ImportManifest:
+    """
+    Checkpoint import per entity dalam file JSON.
+
+    Setiap kali satu chunk selesai di-commit, index record berikutnya dan
+    nomor batch ditulis ke manifest (atomic via ``os.replace``). Checkpoint
+    hanya dipakai kalau ukuran dan mtime file sumber masih sama dan mode
+    import-nya (``insert``/``upsert``) sama. Setelah run selesai entri
+    entity yang di-import dihapus, jadi manifest hanya tersisa dari run
+    yang terputus.
+    """
+
+    def __init__(self, path, mode='insert'):
+        self.path = path
+        self.mode = mode
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+    def signature(self, source):
+        stat = os.stat(source)
+        return {'file': os.path.basename(source), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+    def checkpoint(self, entity, source):
+        entry = self.entries.get(entity, {})
+        if {key: entry.get(key) for key in ('file', 'size', 'mtime')} != self.signature(source):
+            return {}
+        if entry.get('mode', 'insert') != self.mode:
+            return {}
+        return entry
+
+    def commit(self, entity, source, record, batch, done=False):
+        self.entries[entity] = {**self.signature(source), 'mode': self.mode, 'record': record, 'batch': batch,
+                                'done': done}
+        self.save()
+
+    def finish(self, entities):
+        """Buang checkpoint ``entities`` setelah run selesai; file dihapus kalau tidak ada yang tersisa."""
+        for entity in entities:
+            self.entries.pop(entity, None)
+        if self.entries:
+            self.save()
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def read_csv(path):
+    with open(path, newline='') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+
+def read_json(path):
+    with open(path) as jsonfile:
+        yield from iter_json_array(jsonfile)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def copy_literal(value):
+    """Format satu nilai untuk COPY ... FROM STDIN (format text Postgres)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class IterStream:
+    """File-like read() di atas iterator bytes, untuk copy_expert."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class BulkImporter:
+    """
+    Import data seed dari csv_data tanpa query per baris.
+
+    Primary key dan username yang sudah ada dimuat sekali ke dalam set,
+    foreign key diisi langsung lewat id (``course_id``, ``user_id``, ...)
+    dan baris ditulis per chunk di dalam transaksi. Backend ``orm`` memakai
+    ``bulk_create``; backend ``copy`` menulis baris mentah lewat
+    ``COPY FROM STDIN`` di Postgres (``executemany`` di database lain)
+    tanpa membuat instance model. Password user di-hash paralel di process
+    pool (``hash_workers``, default semua core).
+
+    Dengan ``manifest`` run yang terputus bisa dilanjutkan dari chunk
+    terakhir yang sudah di-commit; checkpoint dibuang setelah run selesai.
+    ``upsert=True`` memperbarui baris yang sudah ada lewat
+    ``bulk_create(update_conflicts=True)``: user berdasarkan username, course
+    berdasarkan nama + pengajar, entity lain berdasarkan id. Baris baru dan
+    yang diperbarui dihitung terpisah (``created``/``updated``).
+    """
+
+    natural_keys = {
+        User: ['username'],
+        Course: ['name', 'teacher'],
+    }
+
+    sources = {
+        'users': (User, 'user-data.csv', read_csv, {'username': str, 'password': str}),
+        'courses': (Course, 'course-data.csv', read_csv, {'name': str, 'price': int, 'teacher': int}),
+        'members': (CourseMember, 'member-data.csv', read_csv, {'course_id': int, 'user_id': int}),
+        'contents': (CourseContent, 'contents.json', read_json, {'course_id': int, 'name': str}),
+        'comments': (Comment, 'comments.json', read_json,
+                     {'content_id': int, 'user_id': int, 'comment': str}),
+    }
+
+    def __init__(self, data_dir='./csv_data/', chunk_size=1000, stdout=None, backend='orm',
+                 hash_workers=None, manifest=None, upsert=False):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown import backend: {backend}")
+        if upsert and backend == 'copy':
+            raise ValueError("Upsert is only supported by the orm backend")
+        self.data_dir = data_dir
+        self.chunk_size = chunk_size
+        self.stdout = stdout or sys.stdout
+        self.backend = backend
+        self.hash_workers = hash_workers
+        self.manifest = ImportManifest(manifest, 'upsert' if upsert else 'insert') if manifest else None
+        self.upsert = upsert
+        self._keys = {}
+
+    def run(self, entities=ENTITIES):
+        results = [self.import_entity(entity) for entity in ENTITIES if entity in entities]
+        if self.manifest:
+            self.manifest.finish(s.entity for s in results)
+        # bulk_create/COPY tidak memicu signal, jadi counter course dihitung ulang
+        if any(s.written for s in results if s.entity != 'users'):
+            course_stats.rebuild()
+            if any(s.written for s in results if s.entity in ('courses', 'contents')):
+                search.rebuild()
+            timeline.invalidate()
+        return results
+
+    def import_entity(self, entity):
+        model, filename, reader, required = self.sources[entity]
+        source = os.path.join(self.data_dir, filename)
+        stats = ImportStats(entity)
+        start = time.perf_counter()
+
+        checkpoint = self.manifest.checkpoint(entity, source) if self.manifest else {}
+        if checkpoint.get('done'):
+            self.stdout.write(f"{entity}: already imported according to manifest, skipped\n")
+            return stats
+        first, batch = checkpoint.get('record', 0), checkpoint.get('batch', 0)
+        if first:
+            self.stdout.write(f"{entity}: resuming at record {first} (batch {batch})\n")
+
+        # parse -> validasi -> resolve FK -> tulis per batch, semuanya generator
+        rows = enumerate(islice(reader(source), first, None), first)
+        rows = self.validate(rows, required)
+        values = getattr(self, f'build_{entity}')(rows, stats)
+        written = 0
+        for chunk in batched(values, self.chunk_size):
+            self.write(model, [row for _, row in chunk])
+            written += len(chunk)
+            batch += 1
+            if self.manifest:
+                self.manifest.commit(entity, source, record=chunk[-1][0] + 1, batch=batch)
+        # build_* menghitung baris yang sudah ada (upsert) di stats.updated
+        stats.created = written - stats.updated
+
+        if self.manifest:
+            self.manifest.commit(entity, source, record=first + stats.rows, batch=batch, done=True)
+        if stats.written:
+            self._keys.pop(model, None)
+            self.reset_sequence(model)
+        stats.seconds = time.perf_counter() - start
+        self.stdout.write(f"{stats}\n")
+        return stats
+
+    def write(self, model, chunk):
+        with transaction.atomic():
+            if self.backend == 'copy':
+                self.write_raw(model, chunk)
+            elif self.upsert:
+                unique_fields = self.natural_keys.get(model, [model._meta.pk.name])
+                # path baris lama tidak ditimpa: konten itu bisa punya induk yang diatur di luar import
+                update_fields = [key for key in chunk[0] if key not in ('pk', 'path')
+                                 and model._meta.get_field(key).name not in unique_fields]
+                model.objects.bulk_create([model(**values) for values in chunk], update_conflicts=True,
+                                          unique_fields=unique_fields, update_fields=update_fields)
+            else:
+                model.objects.bulk_create([model(**values) for values in chunk])
+
+    def write_raw(self, model, chunk):
+        fields = [f for f in model._meta.concrete_fields if not f.primary_key or 'pk' in chunk[0]]
+        columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        now = timezone.now()
+        rows = (self.raw_row(fields, values, now) for values in chunk)
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                lines = ('\t'.join(map(copy_literal, row)).encode() + b'\n' for row in rows)
+                cursor.cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", IterStream(lines))
+            else:
+                placeholders = ', '.join(['%s'] * len(fields))
+                cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+    def raw_row(self, fields, values, now):
+        # Isi default dan auto_now yang biasanya dikerjakan oleh model
+        row = []
+        for field in fields:
+            if field.primary_key:
+                value = values['pk']
+            elif field.attname in values:
+                value = values[field.attname]
+            elif getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                value = now
+            else:
+                value = field.get_default()
+            row.append(field.get_db_prep_save(value, connection))
+        return row
+
+    def reset_sequence(self, model):
+        # Postgres: pk diisi manual sehingga sequence harus dinaikkan
+        statements = connection.ops.sequence_reset_sql(no_style(), [model])
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def validate(self, rows, required):
+        # Baris rusak diganti None (bukan dibuang) supaya index record tidak bergeser
+        for num, row in rows:
+            try:
+                if not isinstance(row, dict) or any(row.get(key) in (None, '') for key in required):
+                    raise ValueError
+                row.update({key: convert(row[key]) for key, convert in required.items()})
+            except (TypeError, ValueError):
+                row = None
+            yield num, row
+
+    def taken(self, pk, ids):
+        # Dalam mode upsert baris dengan id yang sudah ada justru diperbarui
+        return not self.upsert and pk in ids
+
+    def existing(self, model, field='pk'):
+        key = model if field == 'pk' else (model, field)
+        if key not in self._keys:
+            self._keys[key] = set(model.objects.values_list(field, flat=True))
+        return self._keys[key]
+
+    def build_users(self, rows, stats):
+        new_rows, passwords = tee(self.new_users(rows, stats))
+        hashes = imap_passwords((row['password'] for _, row in passwords), self.hash_workers)
+        for (num, row), password in zip(new_rows, hashes):
+            yield num, {
+                'username': row['username'],
+                'password': password,
+                'email': row['email'],
+                'first_name': row['firstname'],
+                'last_name': row['lastname'],
+            }
+
+    def new_users(self, rows, stats):
+        # Upsert: hanya cegah username dobel di dalam file yang sama
+        known = self.existing(User, 'username')
+        usernames = set() if self.upsert else known
+        for num, row in rows:
+            stats.rows += 1
+            if row is None or row['username'] in usernames:
+                stats.skipped += 1
+                continue
+            usernames.add(row['username'])
+            stats.updated += row['username'] in known
+            yield num, row
+
+    def build_courses(self, rows, stats):
+        course_ids = self.existing(Course)
+        user_ids = self.existing(User)
+        by_natural_key = {}
+        if self.upsert:
+            by_natural_key = {(name, teacher): pk for pk, name, teacher
+                              in Course.objects.values_list('pk', 'name', 'teacher_id')}
+        seen = set()
+        for num, row in rows:
+            stats.rows += 1
+            key = row and (row['name'], row['teacher'])
+            if row is None or key in seen or row['teacher'] not in user_ids:
+                stats.skipped += 1
+                continue
+            seen.add(key)
+            # Course yang sudah ada (nama + pengajar) tetap memakai id lamanya
+            pk = by_natural_key.get(key)
+            if pk is None:
+                pk = num + 1
+                if pk in course_ids:
+                    stats.skipped += 1
+                    continue
+            else:
+                stats.updated += 1
+            yield num, {
+                'pk': pk,
+                'name': row['name'],
+                'price': row['price'],
+                'description': row['description'],
+                'teacher_id': row['teacher'],
+            }
+
+    def build_members(self, rows, stats):
+        member_ids = self.existing(CourseMember)
+        course_ids = self.existing(Course)
+        user_ids = self.existing(User)
+        # Satu user hanya boleh terdaftar sekali per course (unique_course_member)
+        enrolled = {(course_id, user_id): pk for pk, course_id, user_id
+                    in CourseMember.objects.values_list('pk', 'course_id', 'user_id')}
+        for num, row in rows:
+            stats.rows += 1
+            pair = None if row is None else (row['course_id'], row['user_id'])
+            if (row is None or self.taken(num + 1, member_ids) or enrolled.get(pair, num + 1) != num + 1
+                    or row['course_id'] not in course_ids or row['user_id'] not in user_ids):
+                stats.skipped += 1
+                continue
+            enrolled[pair] = num + 1
+            stats.updated += num + 1 in member_ids
+            yield num, {
+                'pk': num + 1,
+                'course_id': row['course_id'],
+                'user_id': row['user_id'],
+                'roles': row['roles'],
+            }
+
+    def build_contents(self, rows, stats):
+        content_ids = self.existing(CourseContent)
+        course_ids = self.existing(Course)
+        for num, row in rows:
+            stats.rows += 1
+            if row is None or self.taken(num + 1, content_ids) or row['course_id'] not in course_ids:
+                stats.skipped += 1
+                continue
+            stats.updated += num + 1 in content_ids
+            yield num, {
+                'pk': num + 1,
+                'course_id': row['course_id'],
+                'video_url': row.get('video_url'),
+                'name': row['name'],
+                'description': row.get('description') or '-',
+                # Data import tidak punya induk, jadi semua konten adalah akar
+                'path': content_path('', num + 1),
+            }
+
+    def build_comments(self, rows, stats):
+        comment_ids = self.existing(Comment)
+        content_ids = self.existing(CourseContent)
+        member_ids = self.existing(CourseMember)
+        for num, row in rows:
+            stats.rows += 1
+            if row is None or self.taken(num + 1, comment_ids):
+                stats.skipped += 1
+                continue
+            member_id = row['user_id']
+            # Data seed memakai user_id di luar jumlah member; petakan tetap (bukan acak) supaya
+            # import ulang dan resume dari checkpoint menghasilkan member yang sama
+            if member_id > 50:
+                member_id = member_id % 36 + 5
+            if row['content_id'] not in content_ids or member_id not in member_ids:
+                stats.skipped += 1
+                continue
+            stats.updated += num + 1 in comment_ids
+            yield num, {
+                'pk': num + 1,
+                'content_id_id': row['content_id'],
+                'member_id_id': member_id,
+                'comment': row['comment'],
+            }
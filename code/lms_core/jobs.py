@@ -0,0 +1,120 @@
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from lms_core.certificates import cache_path, certificate_key, issue_date, render_to_cache
+from lms_core.models import CertificateJob
+from lms_core.pools import imap_ordered
+
+MAX_ATTEMPTS = 3
+# Job 'running' yang lebih lama dari ini dianggap ditinggal worker yang mati
+LEASE = timedelta(minutes=10)
+
+
+def enqueue_certificate(user, course, day=None):
+    """
+    Buat job sertifikat bertanggal ``day`` (default hari ini), atau kembalikan
+    job yang masih aktif untuk user + course yang sama.
+    """
+    active = CertificateJob.objects.filter(user=user, course=course, status__in=['pending', 'running'])
+    job = active.first()
+    if job is not None:
+        return job
+    day = day or timezone.localdate()
+    try:
+        with transaction.atomic():
+            return CertificateJob.objects.create(user=user, course=course, issued_on=day,
+                                                 cache_key=certificate_key(user, course, issue_date(day)))
+    except IntegrityError:
+        # Request lain membuat job yang sama lebih dulu
+        return active.get()
+
+
+def requeue_if_missing(job):
+    """
+    Kembalikan job ``done`` ke antrean kalau file cache-nya sudah dihapus.
+
+    Mengembalikan job yang harus dipantau: job ini (sudah ``pending``),
+    atau job aktif lain untuk user + course yang sama kalau sudah ada.
+    """
+    if job.status != 'done' or cache_path(job.cache_key).exists():
+        return job
+    try:
+        with transaction.atomic():
+            CertificateJob.objects.filter(id=job.id, status='done').update(
+                status='pending', attempts=0, error='', claimed_by='', claimed_at=None, updated_at=timezone.now())
+    except IntegrityError:
+        # unique_active_certificate_job: sudah ada job aktif untuk user + course ini
+        return CertificateJob.objects.get(user_id=job.user_id, course_id=job.course_id,
+                                          status__in=['pending', 'running'])
+    job.refresh_from_db()
+    return job
+
+
+def claim_jobs(limit):
+    """
+    Ambil sampai ``limit`` job untuk worker ini.
+
+    Di Postgres baris dikunci dengan SELECT ... FOR UPDATE SKIP LOCKED
+    sehingga beberapa worker mendapat job yang berbeda. Di SQLite
+    select_for_update diabaikan; UPDATE bersyarat + token ``claimed_by``
+    memastikan satu job hanya dimenangkan satu worker.
+    """
+    now = timezone.now()
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    claimable = Q(status='pending') | Q(status='running', claimed_at__lt=now - LEASE)
+    with transaction.atomic():
+        ids = list(CertificateJob.objects.select_for_update(skip_locked=True).filter(claimable)
+                   .order_by('created_at', 'id').values_list('id', flat=True)[:limit])
+        CertificateJob.objects.filter(claimable, id__in=ids).update(
+            status='running', claimed_by=token, claimed_at=now, attempts=F('attempts') + 1, updated_at=now)
+    return list(CertificateJob.objects.filter(claimed_by=token, status='running')
+                .select_related('user', 'course'))
+
+
+def _render_job(payload):
+    job_id, args = payload
+    try:
+        render_to_cache(*args)
+    except Exception as e:
+        return job_id, f"{type(e).__name__}: {e}"
+    return job_id, None
+
+
+def run_jobs(jobs, workers=None):
+    payloads = []
+    for job in jobs:
+        args = (job.cache_key, job.user.username, job.course.name, job.course.description,
+                issue_date(job.issued_on))
+        payloads.append((job.id, args))
+
+    attempts = {job.id: job.attempts for job in jobs}
+    done, failed = [], 0
+    for job_id, error in imap_ordered(_render_job, payloads, workers):
+        if error is None:
+            done.append(job_id)
+            continue
+        failed += 1
+        status = 'failed' if attempts[job_id] >= MAX_ATTEMPTS else 'pending'
+        CertificateJob.objects.filter(id=job_id).update(status=status, error=error, updated_at=timezone.now())
+    CertificateJob.objects.filter(id__in=done).update(status='done', error='', updated_at=timezone.now())
+    return len(done), failed
+
+
+def run_worker(workers=None, batch_size=16, poll_interval=2.0, once=False, stdout=None):
+    while True:
+        jobs = claim_jobs(batch_size)
+        if jobs:
+            done, failed = run_jobs(jobs, workers)
+            if stdout:
+                stdout.write(f"{done} sertifikat selesai, {failed} gagal\n")
+        elif once:
+            return
+        else:
+            time.sleep(poll_interval)
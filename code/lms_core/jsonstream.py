@@ -0,0 +1,69 @@
+import json
+
+WHITESPACE = ' \t\n\r'
+
+
+def _expect_end(fp, rest, buffer_size):
+    # Seperti json.load: setelah ']' hanya boleh ada whitespace
+    while rest:
+        if rest.strip(WHITESPACE):
+            raise ValueError("Extra data after JSON array")
+        rest = fp.read(buffer_size)
+
+
+def iter_json_array(fp, buffer_size=64 * 1024):
+    """
+    Yield elemen array JSON top-level satu per satu dari file ``fp``.
+
+    File dibaca per ``buffer_size`` karakter dan setiap elemen di-decode
+    dengan ``JSONDecoder.raw_decode``, jadi memori yang dipakai sebanding
+    dengan ukuran satu record, bukan ukuran file.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos = '', 0
+    started = after_value = after_comma = eof = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in WHITESPACE:
+            pos += 1
+        if pos == len(buffer) or (started and not eof and len(buffer) - pos < buffer_size):
+            if not eof:
+                chunk = fp.read(buffer_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            if pos == len(buffer):
+                raise ValueError("Unexpected end of JSON array")
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+        elif char == ']':
+            if after_comma:
+                raise ValueError("Trailing comma in JSON array")
+            _expect_end(fp, buffer[pos + 1:], buffer_size)
+            return
+        elif after_value:
+            if char != ',':
+                raise ValueError(f"Expected ',' or ']' at character {pos}")
+            after_value, after_comma = False, True
+            pos += 1
+        else:
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                end = None
+            # Record terpotong (atau angka yang mungkin masih berlanjut), baca lagi
+            if end is None or (end == len(buffer) and not eof):
+                chunk = fp.read(buffer_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+            yield record
+            pos = end
+            after_value, after_comma = True, False
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from lms_core.certificates import render_certificate
+from lms_core.pools import get_pool, imap_ordered
+
+
+def _render(num):
+    return render_certificate(f"peserta{num}", "Benchmark Course", "Deskripsi course benchmark", "1 Januari 2025")
+
+
+class Command(BaseCommand):
+    help = "Ukur throughput render sertifikat (sertifikat/detik) untuk beberapa jumlah worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=500)
+        parser.add_argument('--workers', type=int, nargs='+', default=[0, 1, 2, 4, 8],
+                            help="0 = render di proses ini tanpa pool")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        for workers in options['workers']:
+            if workers:
+                # Panaskan pool supaya waktu spawn + django.setup tidak ikut terukur
+                list(get_pool(workers).map(_render, range(workers)))
+            start = time.perf_counter()
+            rendered = sum(1 for _ in imap_ordered(_render, range(count), workers))
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"workers={workers:<3} {rendered} sertifikat dalam {elapsed:.2f}s "
+                              f"({rendered / elapsed:.1f} sertifikat/detik)")
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from lms_core.benchmarking import seed_course
+from lms_core.enrollment import CourseFull, enroll
+from lms_core.models import CourseMember, CourseStats
+
+
+class Command(BaseCommand):
+    help = "Uji enroll paralel ke satu course: jumlah akhir harus pas dengan kuota, dan ukur enrollment/detik"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--capacity', type=int, default=None,
+                            help="Kuota course (default: setengah dari --users)")
+
+    def handle(self, *args, **options):
+        total, threads = options['users'], options['threads']
+        capacity = options['capacity'] if options['capacity'] is not None else total // 2
+
+        course = seed_course(description="Benchmark enrollment", max_participants=capacity)
+        prefix = course.name
+        User.objects.bulk_create([User(username=f"{prefix}-{i}") for i in range(total)], batch_size=1000)
+        users = list(User.objects.filter(username__startswith=f"{prefix}-"))
+
+        results = {'enrolled': 0, 'full': 0, 'retried': 0}
+        lock = threading.Lock()
+
+        def worker(chunk):
+            counts = {'enrolled': 0, 'full': 0, 'retried': 0}
+            try:
+                for user in chunk:
+                    while True:
+                        try:
+                            enroll(user, course)
+                            counts['enrolled'] += 1
+                        except CourseFull:
+                            counts['full'] += 1
+                        except OperationalError:
+                            # SQLite: database is locked, coba lagi
+                            counts['retried'] += 1
+                            continue
+                        break
+            finally:
+                connection.close()
+                with lock:
+                    for key, value in counts.items():
+                        results[key] += value
+
+        chunks = [users[i::threads] for i in range(threads)]
+        start = time.perf_counter()
+        pool = [threading.Thread(target=worker, args=(chunk,)) for chunk in chunks]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        members = CourseMember.objects.filter(course=course).count()
+        counter = CourseStats.objects.get(course=course).students
+        expected = min(capacity, total)
+        self.stdout.write(f"{total} request dari {threads} thread dalam {elapsed:.2f}s "
+                          f"({total / elapsed:.1f} enrollment/detik)")
+        self.stdout.write(f"terdaftar={results['enrolled']} penuh={results['full']} retry={results['retried']} "
+                          f"member={members} counter={counter} kuota={capacity}")
+
+        # CourseMember.course memakai on_delete=RESTRICT
+        CourseMember.objects.filter(course=course).delete()
+        course.delete()
+        User.objects.filter(username__startswith=prefix).delete()
+
+        if not (members == counter == results['enrolled'] == expected):
+            raise CommandError(f"Jumlah peserta tidak sesuai: diharapkan {expected}")
+        self.stdout.write(self.style.SUCCESS("Jumlah peserta tepat sesuai kuota"))
@@ -0,0 +1,44 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from lms_core import exports
+from lms_core.benchmarking import rolled_back, seed_course
+from lms_core.models import ContentCompletion, CourseContent
+
+
+class Command(BaseCommand):
+    help = ("Ukur waktu byte pertama, throughput dan puncak memori export progres course "
+            "(data contoh di-rollback)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--format', choices=list(exports.FORMATS), default='ndjson')
+
+    def handle(self, *args, **options):
+        stream = exports.STREAMS[options['format']]
+        for rows in options['rows']:
+            with rolled_back():
+                course = self.seed(rows)
+                tracemalloc.start()
+                start = time.perf_counter()
+                chunks = stream(exports.course_records(course.pk))
+                size = len(next(chunks))
+                first = time.perf_counter() - start
+                for chunk in chunks:
+                    size += len(chunk)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                self.stdout.write(f"rows={rows:<8} byte pertama {first * 1000:7.1f} ms   "
+                                  f"{rows / elapsed:>9.0f} rows/detik   {size / 2 ** 20:7.1f} MiB   "
+                                  f"puncak memori {peak / 2 ** 20:5.1f} MiB")
+
+    def seed(self, rows):
+        course = seed_course()
+        contents = CourseContent.objects.bulk_create(
+            [CourseContent(course=course, name=f"konten {i}") for i in range(rows)], batch_size=2000)
+        ContentCompletion.objects.bulk_create([ContentCompletion(user=course.teacher, content=content)
+                                               for content in contents], batch_size=2000)
+        return course
@@ -0,0 +1,92 @@
+import csv
+import json
+import os
+import random
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from lms_core.importer import BACKENDS, BulkImporter
+from lms_core.models import Course, CourseMember, CourseContent, Comment
+
+
+class Command(BaseCommand):
+    help = "Bandingkan throughput backend import (orm vs copy) pada dataset sintetis"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000,
+                            help="Jumlah baris member, konten dan komentar masing-masing")
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS)
+
+    def handle(self, *args, **options):
+        for model in (User, Course, CourseMember, CourseContent, Comment):
+            if model.objects.exists():
+                raise CommandError("benchmark_import membutuhkan database kosong")
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            self.stdout.write(f"Membuat dataset sintetis di {data_dir} ...")
+            self.generate(data_dir, options['rows'], options['users'])
+
+            results = {}
+            for backend in options['backends']:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Backend {backend}"))
+                results[backend] = self.run_backend(data_dir, backend, options['chunk_size'])
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Ringkasan (rows/sec)"))
+        for entity in results[options['backends'][0]]:
+            rates = '  '.join(f"{b}={results[b][entity]:>10.0f}" for b in results)
+            self.stdout.write(f"{entity:<10} {rates}")
+
+    def run_backend(self, data_dir, backend, chunk_size):
+        importer = BulkImporter(data_dir, chunk_size=chunk_size, stdout=self.stdout,
+                                backend=backend, hash_workers=0)
+        # Hash password murah supaya yang diukur hanya jalur tulis
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            with transaction.atomic():
+                # Sequence Postgres tidak ikut di-rollback, kembalikan ke 1
+                importer.reset_sequence(User)
+                stats = importer.run()
+                transaction.set_rollback(True)
+        return {s.entity: s.rows_per_sec for s in stats}
+
+    def generate(self, data_dir, rows, users):
+        courses = max(rows // 100, 1)
+        with open(os.path.join(data_dir, 'user-data.csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['firstname', 'lastname', 'email', 'password', 'username'])
+            for i in range(users):
+                writer.writerow([f'First{i}', f'Last{i}', f'user{i}@example.com', f'Pass{i}!', f'user{i}'])
+
+        with open(os.path.join(data_dir, 'course-data.csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'url', 'description', 'site', 'price', 'teacher'])
+            for i in range(courses):
+                writer.writerow([f'Course {i}', '', f'Deskripsi course {i}', '', 100000, random.randint(1, users)])
+
+        with open(os.path.join(data_dir, 'member-data.csv'), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['course_id', 'user_id', 'roles'])
+            for i in range(rows):
+                writer.writerow([random.randint(1, courses), random.randint(1, users), 'std'])
+
+        self.write_json(os.path.join(data_dir, 'contents.json'), (
+            {'video_url': f'https://example.com/v/{i}', 'course_id': random.randint(1, courses),
+             'name': f'Konten {i}', 'description': 'Lorem ipsum dolor sit amet'}
+            for i in range(rows)))
+        self.write_json(os.path.join(data_dir, 'comments.json'), (
+            {'content_id': random.randint(1, rows), 'user_id': random.randint(1, min(rows, 50)),
+             'comment': f'Komentar {i}'}
+            for i in range(rows)))
+
+    def write_json(self, path, records):
+        with open(path, 'w') as f:
+            f.write('[')
+            for i, record in enumerate(records):
+                f.write(',\n' if i else '\n')
+                json.dump(record, f)
+            f.write('\n]')
@@ -0,0 +1,63 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from lms_core import search
+from lms_core.benchmarking import measure, rolled_back, seed_course
+from lms_core.models import CourseContent
+
+
+def vocabulary(size, rng):
+    syllables = ['ka', 'lo', 'mi', 'ra', 'tu', 'se', 'no', 'pi', 'da', 'ge', 'ju', 'ba', 'wi', 'ye', 'ho']
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = ("Bandingkan latency pencarian full-text dengan icontains ala admin pada konten contoh "
+            "(data contoh di-rollback)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000)
+        parser.add_argument('--repeat', type=int, default=5, help="Ambil waktu terbaik dari sekian percobaan")
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError("Database ini tidak punya index full-text")
+        rng = random.Random(42)
+        words = vocabulary(5000, rng)
+        # Kata di awal daftar jauh lebih sering muncul (kira-kira Zipf)
+        weights = [1 / (rank + 1) for rank in range(len(words))]
+        queries = [words[0], words[50], words[2000], f"{words[3]} {words[40]}", words[10][:3]]
+        with rolled_back():
+            course = self.seed(options['rows'], words, weights, rng)
+            contents = CourseContent.objects.filter(course=course)
+            for query in queries:
+                admin = measure(options['repeat'], lambda: self.icontains(contents, query))
+                fts = measure(options['repeat'], lambda: search.search(
+                    query, kind='content', course_id=course.pk, released_only=False))
+                self.stdout.write(f"{query!r:<22} icontains {admin * 1000:9.1f} ms   "
+                                  f"full-text {fts * 1000:8.1f} ms   ({admin / fts:.0f}x)")
+
+    def seed(self, rows, words, weights, rng, batch_size=10000):
+        course = seed_course()
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            contents = CourseContent.objects.bulk_create([
+                CourseContent(course=course, name=' '.join(rng.choices(words, weights, k=5)),
+                              description=' '.join(rng.choices(words, weights, k=20)))
+                for _ in range(min(batch_size, rows - offset))])
+            search.index_many('content', contents)
+        self.stdout.write(f"{rows} konten dibuat dan diindex dalam {time.perf_counter() - start:.0f} detik")
+        return course
+
+    def icontains(self, contents, query):
+        # Seperti changelist admin: satu halaman terurut dan total hasil
+        matches = contents
+        for word in search.terms(query):
+            matches = matches.filter(Q(name__icontains=word) | Q(description__icontains=word))
+        return list(matches.order_by('-pk')[:20]), matches.count()
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from lms_core.benchmarking import measure, rolled_back, seed_course
+from lms_core.fastserializers import values_serializer
+from lms_core.models import ContentCompletion, CourseContent
+from lms_core.serializers import ContentCompletionSerializer, CourseContentSerializer
+
+
+class Command(BaseCommand):
+    help = "Bandingkan rows/detik ModelSerializer DRF dengan ValuesSerializer (data contoh di-rollback)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+        parser.add_argument('--repeat', type=int, default=3, help="Ambil waktu terbaik dari sekian percobaan")
+
+    def handle(self, *args, **options):
+        request = Request(APIRequestFactory().get('/'))
+        for rows in options['rows']:
+            with rolled_back():
+                course, user = self.seed(rows)
+                cases = [
+                    ('CourseContentSerializer', CourseContentSerializer,
+                     CourseContent.objects.filter(course=course)),
+                    ('ContentCompletionSerializer', ContentCompletionSerializer,
+                     ContentCompletion.objects.filter(user=user)),
+                ]
+                for name, serializer_class, queryset in cases:
+                    drf = measure(options['repeat'], lambda: serializer_class(
+                        queryset.all(), many=True, context={'request': request}).data)
+                    fast = measure(options['repeat'], lambda: values_serializer(
+                        serializer_class).serialize(queryset.all(), request))
+                    self.stdout.write(f"{name:<28} rows={rows:<7} DRF {rows / drf:>10.0f} rows/detik   "
+                                      f"values {rows / fast:>10.0f} rows/detik   ({drf / fast:.1f}x)")
+
+    def seed(self, rows):
+        course = seed_course()
+        user = course.teacher
+        contents = CourseContent.objects.bulk_create(
+            [CourseContent(course=course, name=f"konten {i}", video_url="https://example.com/v",
+                           file_attachment=f"materi/{i}.pdf" if i % 2 else None) for i in range(rows)],
+            batch_size=2000)
+        ContentCompletion.objects.bulk_create([ContentCompletion(user=user, content=content) for content in contents],
+                                              batch_size=2000)
+        return course, user
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from lms_core.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "Jalankan worker antrian sertifikat (CertificateJob)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Proses render, default semua core")
+        parser.add_argument('--batch-size', type=int, default=16)
+        parser.add_argument('--poll-interval', type=float, default=2.0)
+        parser.add_argument('--once', action='store_true', help="Berhenti setelah antrian kosong")
+
+    def handle(self, *args, **options):
+        run_worker(workers=options['workers'], batch_size=options['batch_size'],
+                   poll_interval=options['poll_interval'], once=options['once'], stdout=self.stdout)
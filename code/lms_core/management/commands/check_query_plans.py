@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core.queryplans import explain, hot_queries, plan_problems
+
+
+class Command(BaseCommand):
+    help = ("Jalankan EXPLAIN untuk query panas setiap view dan gagal kalau ada full table scan "
+            "(atau sort di luar index untuk halaman keyset)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help="Tampilkan plan lengkap")
+
+    def handle(self, *args, **options):
+        failed = []
+        for name, queryset in hot_queries().items():
+            plan = explain(queryset)
+            problems = plan_problems(name, plan)
+            if problems:
+                failed.append(name)
+                self.stdout.write(self.style.ERROR(f"GAGAL {name}: {', '.join(problems)}"))
+            else:
+                self.stdout.write(f"ok  {name}")
+            if problems or options['verbose_plans']:
+                self.stdout.write('    ' + plan.replace('\n', '\n    '))
+        if failed:
+            raise CommandError(f"{len(failed)} query tidak memakai index dengan benar")
+        self.stdout.write(self.style.SUCCESS("Semua query memakai index"))
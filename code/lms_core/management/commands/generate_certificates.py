@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core.certificates import issue_date, iter_course_certificates, stream_zip
+from lms_core.models import Course
+
+
+class Command(BaseCommand):
+    help = "Buat sertifikat semua peserta satu course ke dalam satu file ZIP"
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', type=int)
+        parser.add_argument('--output', default=None, help="Default sertifikat_course_<id>.zip")
+        parser.add_argument('--workers', type=int, default=None, help="Default semua core")
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.get(id=options['course_id'])
+        except Course.DoesNotExist:
+            raise CommandError("Course not found")
+
+        output = options['output'] or f"sertifikat_course_{course.id}.zip"
+        tanggal = issue_date()
+        count = 0
+
+        def counted(files):
+            nonlocal count
+            for item in files:
+                count += 1
+                yield item
+
+        with open(output, 'wb') as f:
+            for chunk in stream_zip(counted(iter_course_certificates(course, tanggal, options['workers']))):
+                f.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f"{count} sertifikat ditulis ke {output}"))
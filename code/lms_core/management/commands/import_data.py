@@ -0,0 +1,40 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from lms_core.importer import BACKENDS, ENTITIES, BulkImporter
+
+
+class Command(BaseCommand):
+    help = "Import users, courses, members, contents and comments from csv_data"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data-dir', default=str(settings.BASE_DIR / 'csv_data'))
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--only', nargs='+', choices=ENTITIES, default=ENTITIES)
+        parser.add_argument('--backend', choices=BACKENDS, default='orm',
+                            help="'copy' memakai COPY FROM STDIN di Postgres, executemany di SQLite")
+        parser.add_argument('--manifest', default=None,
+                            help="File checkpoint (default <data-dir>/.import-manifest.json)")
+        parser.add_argument('--restart', action='store_true',
+                            help="Abaikan checkpoint lama dan mulai dari awal")
+        parser.add_argument('--upsert', action='store_true',
+                            help="Perbarui baris yang sudah ada (username, nama course + pengajar, id)")
+        parser.add_argument('--hash-workers', type=int, default=None,
+                            help="Jumlah proses untuk hash password (default semua core, 0 = tanpa pool)")
+
+    def handle(self, *args, **options):
+        manifest = options['manifest'] or os.path.join(options['data_dir'], '.import-manifest.json')
+        if options['restart'] and os.path.exists(manifest):
+            os.remove(manifest)
+        try:
+            importer = BulkImporter(options['data_dir'], chunk_size=options['chunk_size'],
+                                    stdout=self.stdout, backend=options['backend'],
+                                    hash_workers=options['hash_workers'],
+                                    manifest=manifest, upsert=options['upsert'])
+        except ValueError as e:
+            raise CommandError(e)
+        stats = importer.run(options['only'])
+        created, updated = sum(s.created for s in stats), sum(s.updated for s in stats)
+        self.stdout.write(self.style.SUCCESS(f"Import selesai: {created} baris baru, {updated} diperbarui"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from lms_core import completions
+
+
+class Command(BaseCommand):
+    help = "Hapus tombstone completion yang lebih tua dari COMPLETION_TOMBSTONE_DAYS"
+
+    def handle(self, *args, **options):
+        total = completions.prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f"{total} tombstone dihapus"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from lms_core import progress
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang tabel CourseProgress dari data completion"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help="Hanya user dengan id ini (boleh diulang)")
+
+    def handle(self, *args, **options):
+        total = progress.rebuild(options['users'])
+        self.stdout.write(self.style.SUCCESS(f"{total} baris progres diperbarui"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from lms_core import stats
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang tabel CourseStats dari data member, konten, komentar dan completion"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Statistik {total} course diperbarui"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from lms_core import search
+
+
+class Command(BaseCommand):
+    help = "Isi ulang index full-text course dan konten (FTS5 di SQLite, tsvector di Postgres)"
+
+    def handle(self, *args, **options):
+        if not search.available():
+            raise CommandError("Database ini tidak punya index full-text; pencarian memakai icontains")
+        with transaction.atomic():
+            total = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{total} dokumen diindex"))
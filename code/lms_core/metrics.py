@@ -0,0 +1,140 @@
+import hmac
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+
+METRICS = (
+    ('lms_request_duration_seconds', "Latency request per route", LATENCY_BUCKETS),
+    ('lms_request_sql_queries', "Jumlah query SQL per request", QUERY_BUCKETS),
+    ('lms_request_sql_duration_seconds', "Total waktu SQL per request", LATENCY_BUCKETS),
+)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Satu slot tambahan untuk +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class Registry:
+    """Histogram per (route, method) di memori proses ini; setiap worker punya registry sendiri."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._responses = {}
+
+    def observe(self, route, method, status, duration, queries, sql_time):
+        key = (route, method)
+        with self._lock:
+            histograms = self._routes.get(key)
+            if histograms is None:
+                histograms = self._routes[key] = [Histogram(buckets) for _, _, buckets in METRICS]
+            for histogram, value in zip(histograms, (duration, queries, sql_time)):
+                histogram.observe(value)
+            status_key = (route, method, str(status))
+            self._responses[status_key] = self._responses.get(status_key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self._responses.clear()
+
+    def render(self):
+        """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)."""
+        lines = []
+        with self._lock:
+            routes = sorted(self._routes.items())
+            responses = sorted(self._responses.items())
+            for index, (name, description, _) in enumerate(METRICS):
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+                for (route, method), histograms in routes:
+                    histogram = histograms[index]
+                    labels = f'route="{_escape(route)}",method="{method}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+            lines += ["# HELP lms_requests_total Jumlah request per route dan status",
+                      "# TYPE lms_requests_total counter"]
+            for (route, method, status), count in responses:
+                lines.append(f'lms_requests_total{{route="{_escape(route)}",method="{method}",'
+                             f'status="{status}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
+
+
+def can_read(request):
+    """Staff yang login, atau scraper dengan header ``Authorization: Bearer <METRICS_TOKEN>``."""
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    header = request.headers.get('Authorization', '')
+    return bool(token) and hmac.compare_digest(header.encode(), f"Bearer {token}".encode())
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` yang menghitung query dan waktu SQL."""
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time += time.perf_counter() - start
+
+
+def query_budget(limit):
+    """
+    Tandai batas jumlah query untuk view function atau class view.
+
+    Middleware mencatat (atau dengan ``QUERY_BUDGET_STRICT`` menggagalkan)
+    request yang melewati batas; ``QueryCountTests`` di lms_core.tests
+    memakai batas yang sama.
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+def budget_for(view):
+    budget = getattr(view, 'query_budget', None)
+    for attribute in ('view_class', 'cls'):
+        if budget is None and hasattr(view, attribute):
+            budget = getattr(getattr(view, attribute), 'query_budget', None)
+    return budget
@@ -0,0 +1,44 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from lms_core.metrics import QueryBudgetExceeded, QueryCounter, budget_for, registry
+
+logger = logging.getLogger(__name__)
+
+
+class QueryMetricsMiddleware:
+    """
+    Catat latency, jumlah query dan waktu SQL setiap request per route.
+
+    Hasilnya dikumpulkan di ``lms_core.metrics.registry`` dan dibaca lewat
+    endpoint ``/metrics``. Pasang paling atas di MIDDLEWARE supaya seluruh
+    request ikut terukur.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = f"/{match.route}" if match is not None and match.route else '<unmatched>'
+        registry.observe(route, request.method, response.status_code, duration, counter.count, counter.time)
+
+        budget = budget_for(match.func) if match is not None else None
+        if budget is not None and counter.count > budget:
+            message = f"{request.method} {route} menjalankan {counter.count} query (budget {budget})"
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
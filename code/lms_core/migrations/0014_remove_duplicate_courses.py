@@ -0,0 +1,33 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:52
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_courses(apps, schema_editor):
+    # Simpan course tertua per (nama, pengajar); peserta dan konten duplikat dipindah ke sana
+    Course = apps.get_model('lms_core', 'Course')
+    CourseMember = apps.get_model('lms_core', 'CourseMember')
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+
+    duplicates = (Course.objects.order_by().values('name', 'teacher')
+                  .annotate(keep=Min('pk'), total=Count('pk')).filter(total__gt=1))
+    for row in duplicates:
+        extra = Course.objects.filter(name=row['name'], teacher=row['teacher']).exclude(pk=row['keep'])
+        # FK course memakai RESTRICT, jadi anak harus dipindah sebelum duplikat dihapus
+        CourseMember.objects.filter(course__in=extra).update(course_id=row['keep'])
+        CourseContent.objects.filter(course__in=extra).update(course_id=row['keep'])
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+    # Terpisah dari AddConstraint: di Postgres FK-nya DEFERRABLE INITIALLY DEFERRED, jadi
+    # ALTER TABLE di transaksi yang sama dengan UPDATE/DELETE ini gagal ("pending trigger events")
+
+    dependencies = [
+        ('lms_core', '0013_alter_course_max_participants'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_courses, migrations.RunPython.noop),
+    ]
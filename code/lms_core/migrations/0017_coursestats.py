@@ -0,0 +1,56 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_stats(apps, schema_editor):
+    Course = apps.get_model('lms_core', 'Course')
+    CourseMember = apps.get_model('lms_core', 'CourseMember')
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    Comment = apps.get_model('lms_core', 'Comment')
+    ContentCompletion = apps.get_model('lms_core', 'ContentCompletion')
+    CourseStats = apps.get_model('lms_core', 'CourseStats')
+
+    def grouped(queryset, key):
+        return dict(queryset.order_by().values_list(key).annotate(total=Count('pk')))
+
+    students = grouped(CourseMember.objects, 'course')
+    contents = grouped(CourseContent.objects, 'course')
+    comments = grouped(Comment.objects, 'content_id__course')
+    approved = grouped(Comment.objects.filter(is_approved=True), 'content_id__course')
+    completions = grouped(ContentCompletion.objects, 'content__course')
+    CourseStats.objects.bulk_create([
+        CourseStats(course_id=pk, students=students.get(pk, 0), contents=contents.get(pk, 0),
+                    comments=comments.get(pk, 0), approved_comments=approved.get(pk, 0),
+                    completions=completions.get(pk, 0))
+        for pk in Course.objects.values_list('pk', flat=True)
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0016_certificatejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseStats',
+            fields=[
+                ('course', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='lms_core.course', verbose_name='matkul')),
+                ('students', models.IntegerField(default=0, verbose_name='jumlah siswa')),
+                ('contents', models.IntegerField(default=0, verbose_name='jumlah konten')),
+                ('comments', models.IntegerField(default=0, verbose_name='jumlah komentar')),
+                ('approved_comments', models.IntegerField(default=0, verbose_name='komentar disetujui')),
+                ('completions', models.IntegerField(default=0, verbose_name='konten selesai')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Statistik Matkul',
+                'verbose_name_plural': 'Statistik Matkul',
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:59
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_members(apps, schema_editor):
+    # Simpan pendaftaran tertua per (user, course); komentar dari duplikat dipindah ke sana
+    CourseMember = apps.get_model('lms_core', 'CourseMember')
+    Comment = apps.get_model('lms_core', 'Comment')
+    CourseStats = apps.get_model('lms_core', 'CourseStats')
+
+    duplicates = (CourseMember.objects.order_by().values('user', 'course')
+                  .annotate(keep=Min('pk'), total=Count('pk')).filter(total__gt=1))
+    courses = set()
+    for row in duplicates:
+        extra = CourseMember.objects.filter(user=row['user'], course=row['course']).exclude(pk=row['keep'])
+        Comment.objects.filter(member_id__in=extra).update(member_id=row['keep'])
+        extra.delete()
+        courses.add(row['course'])
+    for course_id in courses:
+        CourseStats.objects.filter(course_id=course_id).update(
+            students=CourseMember.objects.filter(course_id=course_id).count())
+
+
+class Migration(migrations.Migration):
+    # Constraint-nya ada di 0019, dengan alasan yang sama seperti 0014
+
+    dependencies = [
+        ('lms_core', '0017_coursestats'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_members, migrations.RunPython.noop),
+    ]
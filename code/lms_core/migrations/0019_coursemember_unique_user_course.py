@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0018_remove_duplicate_members'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='coursemember',
+            constraint=models.UniqueConstraint(fields=('user', 'course'), name='unique_course_member'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0019_coursemember_unique_user_course'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['content_id', 'created_at', 'id'], name='comment_content_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', False)), fields=['created_at', 'id'], name='comment_pending_page_idx'),
+        ),
+    ]
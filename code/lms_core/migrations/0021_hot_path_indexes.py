@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0020_comment_page_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_id', 'is_approved'], name='comment_content_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['course', 'release_time'], name='content_course_release_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['release_time'], name='content_release_idx'),
+        ),
+    ]
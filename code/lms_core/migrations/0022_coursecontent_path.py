@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:12
+
+from django.db import migrations, models
+
+
+def fill_paths(apps, schema_editor):
+    # Sama dengan lms_core.outline.rebuild_paths, ditulis ulang untuk model historis
+    CourseContent = apps.get_model('lms_core', 'CourseContent')
+    parents = dict(CourseContent.objects.values_list('pk', 'parent_id'))
+    paths = {}
+
+    def path_of(pk, seen=()):
+        if pk not in paths:
+            parent = parents.get(pk)
+            prefix = '' if parent is None or parent not in parents or parent in seen \
+                else path_of(parent, seen + (pk,))
+            paths[pk] = f"{prefix}{pk:010d}/"
+        return paths[pk]
+
+    contents = [CourseContent(pk=pk, path=path_of(pk)) for pk in parents]
+    CourseContent.objects.bulk_update(contents, ['path'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0021_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursecontent',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255, verbose_name='path'),
+        ),
+        migrations.AddIndex(
+            model_name='coursecontent',
+            index=models.Index(fields=['course', 'path'], name='content_course_path_idx'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
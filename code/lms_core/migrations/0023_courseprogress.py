@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_progress(apps, schema_editor):
+    ContentCompletion = apps.get_model('lms_core', 'ContentCompletion')
+    CourseProgress = apps.get_model('lms_core', 'CourseProgress')
+    rows = (ContentCompletion.objects.order_by().values('user_id', course_id=F('content__course_id'))
+            .annotate(completed=Count('pk')))
+    CourseProgress.objects.bulk_create([CourseProgress(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0022_coursecontent_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed', models.IntegerField(default=0, verbose_name='konten selesai')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='lms_core.course', verbose_name='matkul')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='siswa')),
+            ],
+            options={
+                'verbose_name': 'Progres Siswa',
+                'verbose_name_plural': 'Progres Siswa',
+                'constraints': [models.UniqueConstraint(fields=('user', 'course'), name='unique_course_progress')],
+            },
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0023_courseprogress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contentcompletion',
+            index=models.Index(fields=['user', 'completed_at', 'id'], name='completion_user_sync_idx'),
+        ),
+    ]
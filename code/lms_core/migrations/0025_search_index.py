@@ -0,0 +1,68 @@
+from django.db import migrations
+
+SQLITE = [
+    """
+    CREATE VIRTUAL TABLE lms_search USING fts5(
+        name, description, course_id UNINDEXED, release_time UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        -- index awalan 2-4 huruf untuk pencarian sambil mengetik
+        prefix = '2 3 4'
+    )
+    """,
+    # rowid = pk * 2 + jenis (0 course, 1 konten), sama dengan lms_core.search.doc_id
+    """
+    INSERT INTO lms_search (rowid, course_id, release_time, name, description)
+    SELECT id * 2, id, NULL, name, description FROM lms_core_course
+    """,
+    """
+    INSERT INTO lms_search (rowid, course_id, release_time, name, description)
+    SELECT id * 2 + 1, course_id, release_time, name, description FROM lms_core_coursecontent
+    """,
+]
+
+POSTGRES = [
+    """
+    CREATE TABLE lms_search (
+        id bigint PRIMARY KEY,
+        course_id integer,
+        release_time timestamp with time zone,
+        name text NOT NULL,
+        description text NOT NULL,
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', name), 'A') || setweight(to_tsvector('simple', description), 'B')
+        ) STORED
+    )
+    """,
+    "CREATE INDEX lms_search_document_idx ON lms_search USING GIN (document)",
+    """
+    INSERT INTO lms_search (id, course_id, release_time, name, description)
+    SELECT id * 2, id, NULL, name, description FROM lms_core_course
+    """,
+    """
+    INSERT INTO lms_search (id, course_id, release_time, name, description)
+    SELECT id * 2 + 1, course_id, release_time, name, description FROM lms_core_coursecontent
+    """,
+]
+
+
+def create_search_index(apps, schema_editor):
+    # Database lain tidak punya index full-text; lms_core.search memakai icontains
+    statements = {'sqlite': SQLITE, 'postgresql': POSTGRES}.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS lms_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0024_completion_sync_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 18:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0025_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_pending_page_idx',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='diklaim pada'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='claimed_comments', to=settings.AUTH_USER_MODEL, verbose_name='diklaim oleh'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='is_rejected',
+            field=models.BooleanField(default=False, verbose_name='ditolak'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_approved', False), ('is_rejected', False)), fields=['created_at', 'id'], name='comment_pending_page_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 19:39
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lms_core', '0027_completiontombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificatejob',
+            name='issued_on',
+            field=models.DateField(default=django.utils.timezone.localdate, verbose_name='tanggal terbit'),
+        ),
+    ]
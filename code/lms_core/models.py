@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Concat, Substr
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -22,6 +24,9 @@ class Course(models.Model):
         verbose_name = "Mata Kuliah"
         verbose_name_plural = "Data Mata Kuliah"
         ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["name", "teacher"], name="unique_course_name_teacher"),
+        ]
 
     def is_member(self, user):
         return CourseMember.objects.filter(course_id=self, user_id=user).exists()
@@ -38,10 +43,20 @@ class CourseMember(models.Model):
     class Meta:
         verbose_name = "Subscriber Matkul"
         verbose_name_plural = "Subscriber Matkul"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "course"], name="unique_course_member"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id} {self.course_id} : {self.user_id}"
 
+PATH_WIDTH = 10
+
+
+def content_path(parent_path, pk):
+    return f"{parent_path}{pk:0{PATH_WIDTH}d}/"
+
+
 class CourseContent(models.Model):
     name = models.CharField("judul konten", max_length=200)
     description = models.TextField("deskripsi", default='-')
@@ -53,16 +68,43 @@ class CourseContent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     release_time = models.DateTimeField(default=timezone.now)
+    # Id semua leluhur sampai konten ini, misalnya "0000000003/0000000012/"; dijaga oleh save()
+    path = models.CharField("path", max_length=255, default='', editable=False)
     
 
 
     class Meta:
         verbose_name = "Konten Matkul"
         verbose_name_plural = "Konten Matkul"
+        indexes = [
+            # Konten yang sudah rilis, per course dan untuk semua course
+            models.Index(fields=["course", "release_time"], name="content_course_release_idx"),
+            models.Index(fields=["release_time"], name="content_release_idx"),
+            # Outline course: satu range scan yang sudah terurut pre-order
+            models.Index(fields=["course", "path"], name="content_course_path_idx"),
+        ]
 
     def __str__(self) -> str:
         return f'{self.course_id} {self.name}'
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            paths = dict(CourseContent.objects.filter(pk__in=[self.pk, self.parent_id_id])
+                         .values_list('pk', 'path')) if self.pk or self.parent_id_id else {}
+            old_path = paths.get(self.pk, '') if self.pk else ''
+            parent_path = paths.get(self.parent_id_id, '')
+            if old_path and parent_path.startswith(old_path):
+                raise ValueError("Konten tidak bisa dipindah ke bawah dirinya sendiri.")
+            super().save(*args, **kwargs)
+
+            self.path = content_path(parent_path, self.pk)
+            if old_path and old_path != self.path:
+                # Pindah induk: path konten ini dan semua turunannya diganti awalannya
+                CourseContent.objects.filter(path__startswith=old_path).update(
+                    path=Concat(Value(self.path), Substr('path', len(old_path) + 1)))
+            elif old_path != self.path:
+                CourseContent.objects.filter(pk=self.pk).update(path=self.path)
+
 
 class Comment(models.Model):
     content_id = models.ForeignKey(CourseContent, verbose_name="konten", on_delete=models.CASCADE)
@@ -71,10 +113,23 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_approved = models.BooleanField(default=False)
+    # Komentar yang ditolak moderator keluar dari antrean tanpa dihapus
+    is_rejected = models.BooleanField("ditolak", default=False)
+    claimed_by = models.ForeignKey(User, verbose_name="diklaim oleh", on_delete=models.SET_NULL,
+                                   null=True, blank=True, related_name="claimed_comments")
+    claimed_at = models.DateTimeField("diklaim pada", null=True, blank=True)
 
     class Meta:
         verbose_name = "Komentar"
         verbose_name_plural = "Komentar"
+        indexes = [
+            models.Index(fields=["content_id", "is_approved"], name="comment_content_approved_idx"),
+            # Halaman komentar per konten dan antrean moderasi diurutkan (created_at, id)
+            models.Index(fields=["content_id", "created_at", "id"], condition=models.Q(is_approved=True),
+                         name="comment_content_page_idx"),
+            models.Index(fields=["created_at", "id"], condition=models.Q(is_approved=False, is_rejected=False),
+                         name="comment_pending_page_idx"),
+        ]
 
     def __str__(self):
         return f"Komen: {self.member_id.user_id.__str__()} - {self.comment}"
@@ -85,4 +140,89 @@ class ContentCompletion(models.Model):
     completed_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ['user', 'content']
\ No newline at end of file
+        unique_together = ['user', 'content']
+        indexes = [
+            # Sync completion per user diurutkan (completed_at, id)
+            models.Index(fields=["user", "completed_at", "id"], name="completion_user_sync_idx"),
+        ]
+
+class CompletionTombstone(models.Model):
+    """Completion yang dihapus, supaya sync inkremental (lms_core.completions) bisa ikut menghapusnya di klien."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    # Bukan FK: kontennya bisa saja sudah dihapus
+    content_id = models.BigIntegerField("id konten")
+    deleted_at = models.DateTimeField("dihapus pada", default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="tombstone_user_sync_idx"),
+        ]
+
+class CourseStats(models.Model):
+    """Counter per course yang dijaga tetap sinkron oleh lms_core.stats."""
+    course = models.OneToOneField(Course, verbose_name="matkul", on_delete=models.CASCADE,
+                                  primary_key=True, related_name="stats")
+    students = models.IntegerField("jumlah siswa", default=0)
+    contents = models.IntegerField("jumlah konten", default=0)
+    comments = models.IntegerField("jumlah komentar", default=0)
+    approved_comments = models.IntegerField("komentar disetujui", default=0)
+    completions = models.IntegerField("konten selesai", default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Statistik Matkul"
+        verbose_name_plural = "Statistik Matkul"
+
+    def __str__(self) -> str:
+        return f"Statistik {self.course_id}"
+
+
+class CourseProgress(models.Model):
+    """Jumlah konten yang sudah diselesaikan user di satu course, dijaga oleh lms_core.progress."""
+    user = models.ForeignKey(User, verbose_name="siswa", on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, verbose_name="matkul", on_delete=models.CASCADE,
+                               related_name="progress")
+    completed = models.IntegerField("konten selesai", default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Progres Siswa"
+        verbose_name_plural = "Progres Siswa"
+        constraints = [
+            models.UniqueConstraint(fields=["user", "course"], name="unique_course_progress"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Progres {self.user_id} di {self.course_id}"
+
+
+JOB_STATUS = [('pending', "Menunggu"), ('running', "Diproses"), ('done', "Selesai"), ('failed', "Gagal")]
+
+class CertificateJob(models.Model):
+    user = models.ForeignKey(User, verbose_name="siswa", on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, verbose_name="matkul", on_delete=models.CASCADE)
+    cache_key = models.CharField("kunci cache", max_length=64)
+    # Tanggal yang dicetak; ikut menentukan cache_key
+    issued_on = models.DateField("tanggal terbit", default=timezone.localdate)
+    status = models.CharField("status", max_length=10, choices=JOB_STATUS, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    claimed_by = models.CharField(max_length=100, blank=True, default='')
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Antrian Sertifikat"
+        verbose_name_plural = "Antrian Sertifikat"
+        constraints = [
+            # Klik berulang untuk course yang sama memakai job yang sama
+            models.UniqueConstraint(fields=["user", "course"], condition=models.Q(status__in=["pending", "running"]),
+                                    name="unique_active_certificate_job"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="certjob_status_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id} {self.user_id} : {self.course_id} ({self.status})"
@@ -0,0 +1,94 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from lms_core import stats
+from lms_core.models import Comment, Course
+
+# Klaim yang lebih lama dari ini dianggap ditinggal moderatornya
+LEASE = timedelta(minutes=15)
+
+
+def approved(content_id):
+    """Komentar yang tampil di halaman konten ``content_id``."""
+    return Comment.objects.filter(content_id=content_id, is_approved=True)
+
+
+def written_by(user):
+    """Semua komentar ``user`` di semua course, apa pun statusnya."""
+    return Comment.objects.filter(member_id__user_id=user)
+
+
+def pending():
+    """Antrean moderasi: belum disetujui dan belum ditolak."""
+    return Comment.objects.filter(is_approved=False, is_rejected=False)
+
+
+def claimable(moderator, now=None):
+    now = now or timezone.now()
+    free = Q(claimed_by__isnull=True) | Q(claimed_at__lt=now - LEASE) | Q(claimed_by=moderator)
+    return pending().filter(free)
+
+
+def claim(moderator, limit=50):
+    """
+    Ambil sampai ``limit`` komentar pending tertua untuk ``moderator``.
+
+    Sama dengan lms_core.jobs.claim_jobs: di Postgres baris dikunci dengan
+    SELECT ... FOR UPDATE SKIP LOCKED sehingga moderator yang mengklaim
+    bersamaan mendapat batch yang berbeda. Di SQLite select_for_update
+    diabaikan; UPDATE bersyarat dan stempel ``claimed_at`` memastikan satu
+    komentar hanya dimenangkan satu moderator. Klaim yang lebih tua dari
+    ``LEASE`` boleh diambil moderator lain.
+    """
+    now = timezone.now()
+    available = claimable(moderator, now)
+    with transaction.atomic():
+        ids = list(available.select_for_update(skip_locked=True, of=('self',))
+                   .order_by('created_at', 'id').values_list('id', flat=True)[:limit])
+        claimable(moderator, now).filter(id__in=ids).update(claimed_by=moderator, claimed_at=now)
+    return Comment.objects.filter(claimed_by=moderator, claimed_at=now).order_by('created_at', 'id')
+
+
+def release(moderator, comments=None):
+    """Lepas klaim ``moderator`` (semua, atau hanya ``comments``) supaya bisa diambil moderator lain."""
+    comments = Comment.objects.all() if comments is None else comments
+    return comments.filter(claimed_by=moderator).update(claimed_by=None, claimed_at=None)
+
+
+def _moderate(comments, approved):
+    target = {'is_approved': approved, 'is_rejected': not approved}
+    with transaction.atomic():
+        rows = list(comments.exclude(**target).select_for_update(of=('self',)).order_by()
+                    .values_list('id', 'is_approved', 'content_id__course'))
+        ids = [pk for pk, _, _ in rows]
+        updated = Comment.objects.filter(id__in=ids).update(claimed_by=None, claimed_at=None, **target)
+        # Counter komentar disetujui per course berubah sebanyak baris yang pindah status
+        deltas = Counter()
+        for _, was_approved, course_id in rows:
+            if approved != was_approved:
+                deltas[course_id] += 1 if approved else -1
+        if updated == len(rows):
+            stats.bump_many('approved_comments', deltas)
+        else:
+            # Baris berubah di tengah jalan (SQLite tidak mengunci baris): hitung ulang
+            stats.rebuild(Course.objects.filter(pk__in={course_id for _, _, course_id in rows}))
+    return ids
+
+
+def approve(comments):
+    """
+    Setujui semua komentar di queryset ``comments`` dengan satu UPDATE ... WHERE id IN (...).
+
+    Klaim ikut dilepas dan CourseStats diperbarui sekali untuk semua
+    course. Mengembalikan id komentar yang statusnya berubah.
+    """
+    return _moderate(comments, approved=True)
+
+
+def reject(comments):
+    """Tolak semua komentar di queryset ``comments``; sama dengan ``approve``."""
+    return _moderate(comments, approved=False)
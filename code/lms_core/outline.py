@@ -0,0 +1,81 @@
+from django.utils import timezone
+
+from lms_core.models import CourseContent, content_path
+
+
+def compute_paths(rows):
+    """
+    Path materialized untuk pasangan ``(pk, parent_pk)``.
+
+    Konten yang induknya tidak ada (atau ada di dalam siklus) dianggap
+    akar, supaya data lama yang rusak tetap dapat path.
+    """
+    parents = dict(rows)
+    paths = {}
+
+    def resolve(pk):
+        chain = []
+        while pk not in paths:
+            chain.append(pk)
+            parent = parents.get(pk)
+            if parent is None or parent not in parents or parent in chain:
+                paths[pk] = content_path('', pk)
+                chain.pop()
+                break
+            pk = parent
+        for node in reversed(chain):
+            paths[node] = content_path(paths[parents[node]], node)
+
+    for pk in parents:
+        resolve(pk)
+    return paths
+
+
+def rebuild_paths(batch_size=1000):
+    """
+    Hitung ulang semua ``CourseContent.path``, misalnya setelah data rusak. Mengembalikan jumlah yang berubah.
+
+    Hanya pasangan id dan path yang disimpan di memori; instance model
+    dibuat per batch yang ditulis.
+    """
+    rows = CourseContent.objects.values_list('pk', 'parent_id', 'path').iterator(chunk_size=batch_size)
+    parents, current = {}, {}
+    for pk, parent, path in rows:
+        parents[pk], current[pk] = parent, path
+    changed = [(pk, path) for pk, path in compute_paths(parents.items()).items() if current[pk] != path]
+    for start in range(0, len(changed), batch_size):
+        CourseContent.objects.bulk_update([CourseContent(pk=pk, path=path)
+                                           for pk, path in changed[start:start + batch_size]], ['path'])
+    return len(changed)
+
+
+def outline_rows(course_id):
+    """(id, parent_id, name, release_time) semua konten course, urut pre-order menurut path."""
+    return (CourseContent.objects.filter(course_id=course_id).order_by('path')
+            .values_list('id', 'parent_id', 'name', 'release_time'))
+
+
+def course_outline(course_id, released_only=True, now=None):
+    """
+    Pohon konten satu course dari satu query yang diurutkan menurut path.
+
+    Urutan path adalah urutan pre-order, jadi induk selalu muncul sebelum
+    anaknya dan pohon bisa disusun dalam satu kali jalan. Kalau
+    ``released_only``, konten yang belum rilis disembunyikan beserta semua
+    turunannya.
+    """
+    now = now or timezone.now()
+    nodes, roots = {}, []
+    for pk, parent_id, name, release_time in outline_rows(course_id):
+        if released_only and release_time > now:
+            continue
+        node = {'id': pk, 'name': name, 'release_time': release_time, 'children': []}
+        if parent_id is None:
+            roots.append(node)
+        elif parent_id in nodes:
+            nodes[parent_id]['children'].append(node)
+        else:
+            # Induk disembunyikan atau berada di course lain
+            continue
+        nodes[pk] = node
+    return roots
@@ -0,0 +1,114 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, List, Optional
+
+from django.conf import settings
+from django.db.models import Q
+from ninja import Field, Schema
+from ninja.errors import HttpError
+from ninja.pagination import PaginationBase
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def page_size_limits():
+    return getattr(settings, 'CURSOR_PAGE_SIZE', 50), getattr(settings, 'CURSOR_MAX_PAGE_SIZE', 200)
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Cursor tidak valid.")
+
+
+def parse_page_size(value):
+    default, maximum = page_size_limits()
+    if value in (None, ''):
+        return default
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise InvalidCursor("page_size harus berupa angka.")
+    if size < 1:
+        raise InvalidCursor("page_size minimal 1.")
+    return min(size, maximum)
+
+
+def keyset_queryset(queryset, cursor, limit, key='created_at'):
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(**{f'{key}__gt': value}) | Q(**{key: value, 'pk__gt': pk}))
+    return queryset.order_by(key, 'pk')[:limit]
+
+
+def keyset_page(queryset, cursor=None, page_size=None, key='created_at'):
+    """
+    Ambil satu halaman ``queryset`` terurut (``key``, id) mulai setelah ``cursor``.
+
+    Posisi halaman berikutnya disimpan di cursor, bukan OFFSET, sehingga
+    dengan index komposit (..., ``key``, id) setiap halaman cukup satu
+    range scan berapa pun jauhnya. Mengembalikan (items, next_cursor).
+    """
+    page_size = page_size or page_size_limits()[0]
+    items = list(keyset_queryset(queryset, cursor, page_size + 1, key))
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, key), last.pk)
+    return items, next_cursor
+
+
+def cursor_response(request, queryset, serializer_class, key='created_at'):
+    """Response DRF satu halaman keyset: ``results``, ``next_cursor`` dan URL ``next``."""
+    try:
+        page_size = parse_page_size(request.query_params.get('page_size'))
+        items, next_cursor = keyset_page(queryset, request.query_params.get('cursor'), page_size, key)
+    except InvalidCursor as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    next_url = None
+    if next_cursor:
+        next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+    return Response({
+        'results': serializer_class(items, many=True).data,
+        'next_cursor': next_cursor,
+        'next': next_url,
+    })
+
+
+class KeysetPagination(PaginationBase):
+    """Pagination Ninja untuk keyset_page: ``?cursor=...&page_size=...``."""
+
+    class Input(Schema):
+        cursor: Optional[str] = None
+        page_size: Optional[int] = Field(None, ge=1)
+
+    class Output(Schema):
+        items: List[Any]
+        next_cursor: Optional[str]
+
+    def __init__(self, key='created_at', **kwargs):
+        self.key = key
+        super().__init__(**kwargs)
+
+    def paginate_queryset(self, queryset, pagination, **params):
+        try:
+            page_size = parse_page_size(pagination.page_size)
+            items, next_cursor = keyset_page(queryset, pagination.cursor, page_size, self.key)
+        except InvalidCursor as e:
+            raise HttpError(400, str(e))
+        return {'items': items, 'next_cursor': next_cursor}
@@ -0,0 +1,169 @@
+import typing
+from dataclasses import dataclass, field
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from pydantic import BaseModel
+from rest_framework import serializers
+
+
+@dataclass
+class FieldSpec:
+    """Satu field output: nama atribut di model, field anak kalau nested, dan apakah berupa list."""
+    source: str
+    children: typing.Optional[list] = None
+    many: bool = False
+
+
+# Field yang nilainya dihitung sendiri (method, resolver); kolom model tidak bisa dibatasi
+OPAQUE = FieldSpec('*')
+
+
+@dataclass
+class LoadPlan:
+    select_related: list = field(default_factory=list)
+    prefetch_related: list = field(default_factory=list)
+    only: list = field(default_factory=list)
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def _unwrap(annotation):
+    """Kembalikan (schema nested atau None, many) dari anotasi seperti Optional[List[Schema]]."""
+    many = False
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin in (list, tuple, set, typing.List):
+            many = True
+            annotation = typing.get_args(annotation)[0]
+        elif origin is typing.Union or type(annotation).__name__ == 'UnionType':
+            args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+            if len(args) != 1:
+                return None, many
+            annotation = args[0]
+        else:
+            break
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, many
+    return None, many
+
+
+def schema_fields(schema):
+    """FieldSpec dari Ninja ``Schema``; alias dipakai sebagai nama atribut seperti saat Ninja me-resolve."""
+    specs = []
+    for name, info in schema.model_fields.items():
+        if hasattr(schema, f'resolve_{name}'):
+            specs.append(OPAQUE)
+            continue
+        nested, many = _unwrap(info.annotation)
+        source = info.validation_alias if isinstance(info.validation_alias, str) else info.alias or name
+        if '.' in source:
+            specs.append(OPAQUE)
+            continue
+        specs.append(FieldSpec(source, schema_fields(nested) if nested else None, many))
+    return specs
+
+
+def serializer_fields(serializer):
+    """FieldSpec dari serializer DRF (class atau instance)."""
+    if isinstance(serializer, type):
+        serializer = serializer()
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    specs = []
+    for item in serializer.fields.values():
+        if item.write_only:
+            continue
+        if item.source == '*' or '.' in item.source:
+            specs.append(OPAQUE)
+        elif isinstance(item, serializers.ListSerializer):
+            specs.append(FieldSpec(item.source, serializer_fields(item.child), True))
+        elif isinstance(item, serializers.BaseSerializer):
+            specs.append(FieldSpec(item.source, serializer_fields(item)))
+        elif isinstance(item, serializers.ManyRelatedField):
+            specs.append(FieldSpec(item.source, [FieldSpec('pk')], True))
+        else:
+            specs.append(FieldSpec(item.source))
+    return specs
+
+
+def _model_field(model, name):
+    if name == 'pk':
+        return model._meta.pk
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        pass
+    for candidate in model._meta.get_fields():
+        # Nama kolom FK (``content_id_id`` untuk FK ``content_id``) atau accessor reverse (``comment_set``)
+        if getattr(candidate, 'attname', None) == name:
+            return candidate
+        if candidate.auto_created and not candidate.concrete and candidate.get_accessor_name() == name:
+            return candidate
+    return None
+
+
+def build_plan(model, specs, plan=None, prefix=''):
+    """
+    Susun select_related/prefetch_related/only untuk ``specs`` mulai dari ``model``.
+
+    FK dan one-to-one yang ditampilkan nested di-join dengan select_related,
+    relasi many (reverse FK, many-to-many) di-prefetch dengan queryset yang
+    juga direncanakan, dan kolom yang tidak ditampilkan tidak di-load.
+    Kalau ada field yang tidak bisa dipetakan ke kolom (method, property),
+    semua kolom model itu di-load supaya tidak ada query per baris.
+    """
+    plan = plan or LoadPlan()
+    columns, complete = {model._meta.pk.name}, True
+    for spec in specs:
+        model_field = None if spec is OPAQUE else _model_field(model, spec.source)
+        if model_field is None:
+            complete = False
+        elif model_field.many_to_many or model_field.one_to_many:
+            name = model_field.name if model_field.concrete else model_field.get_accessor_name()
+            related = model_field.related_model
+            inner = build_plan(related, spec.children or [FieldSpec('pk')])
+            if model_field.one_to_many:
+                # Prefetch mencocokkan baris lewat FK ke induk
+                inner.only.append(model_field.field.name)
+            plan.prefetch_related.append(Prefetch(f'{prefix}{name}', queryset=inner.apply(related.objects.all())))
+        elif model_field.is_relation and spec.children is not None:
+            name = model_field.name if model_field.concrete else model_field.get_accessor_name()
+            if model_field.concrete:
+                columns.add(name)
+            plan.select_related.append(f'{prefix}{name}')
+            build_plan(model_field.related_model, spec.children, plan, f'{prefix}{name}__')
+        elif model_field.concrete:
+            columns.add(model_field.name)
+        else:
+            complete = False
+
+    if not complete:
+        columns = {f.name for f in model._meta.concrete_fields}
+    plan.only.extend(f'{prefix}{name}' for name in sorted(columns))
+    return plan
+
+
+def plan_for(model, output):
+    specs = schema_fields(output) if isinstance(output, type) and issubclass(output, BaseModel) \
+        else serializer_fields(output)
+    return build_plan(model, specs)
+
+
+def optimize(queryset, output, also=()):
+    """
+    Terapkan rencana load dari Ninja ``Schema`` atau serializer DRF ``output`` ke ``queryset``.
+
+    ``also`` untuk kolom yang dipakai di luar output, misalnya kunci urutan
+    cursor pagination.
+    """
+    plan = plan_for(queryset.model, output)
+    plan.only.extend(also)
+    return plan.apply(queryset)
@@ -0,0 +1,60 @@
+import atexit
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+_pools = {}
+
+
+def _init_worker():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'simplelms.settings')
+    import django
+    django.setup()
+
+
+def worker_count(workers=None):
+    """Jumlah worker: ``workers`` kalau diisi (0 = di proses ini), selain itu jumlah CPU."""
+    return (os.cpu_count() or 1) if workers is None else workers
+
+
+def get_pool(workers=None):
+    workers = workers or worker_count()
+    if workers not in _pools:
+        # spawn: worker tidak mewarisi koneksi database milik proses induk
+        _pools[workers] = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        )
+    return _pools[workers]
+
+
+@atexit.register
+def shutdown():
+    """Matikan semua pool milik proses ini; dipanggil otomatis saat interpreter keluar."""
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown(cancel_futures=True)
+
+
+def imap_ordered(fn, items, workers=None):
+    """
+    Jalankan ``fn`` untuk setiap item di process pool, yield hasil sesuai urutan input.
+
+    Paling banyak dua task per worker yang sedang berjalan, jadi ``items``
+    boleh generator panjang. ``workers=0`` menjalankan ``fn`` di proses ini.
+    """
+    if workers == 0:
+        yield from map(fn, items)
+        return
+
+    workers = workers or worker_count()
+    pool = get_pool(workers)
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= workers * 2:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
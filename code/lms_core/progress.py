@@ -0,0 +1,66 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from lms_core.models import ContentCompletion, CourseMember, CourseProgress
+
+
+def bump(user_id, course_id, delta):
+    """
+    Tambah/kurangi jumlah konten selesai satu user di satu course.
+
+    Kalau barisnya belum ada, baris dibuat dari hitungan ulang completion
+    user di course itu (perubahan yang memicu bump sudah ikut terhitung).
+    """
+    if course_id is None or not delta:
+        return
+    rows = CourseProgress.objects.filter(user_id=user_id, course_id=course_id)
+    if rows.update(completed=F('completed') + delta):
+        return
+    completed = ContentCompletion.objects.filter(user_id=user_id, content__course_id=course_id).count()
+    try:
+        with transaction.atomic():
+            CourseProgress.objects.create(user_id=user_id, course_id=course_id, completed=completed)
+    except IntegrityError:
+        rows.update(completed=F('completed') + delta)
+
+
+def refresh(user_id, course_ids):
+    """Hitung ulang progres satu user di ``course_ids`` dari completion-nya, dengan satu upsert."""
+    rows = (ContentCompletion.objects.filter(user_id=user_id, content__course_id__in=course_ids).order_by()
+            .values(course_id=F('content__course_id')).annotate(completed=Count('pk')))
+    CourseProgress.objects.bulk_create([CourseProgress(user_id=user_id, **row) for row in rows],
+                                       update_conflicts=True, unique_fields=['user', 'course'],
+                                       update_fields=['completed', 'updated_at'])
+
+
+def rebuild(user_ids=None):
+    """Hitung ulang CourseProgress dari ContentCompletion. Mengembalikan jumlah baris progres."""
+    completions = ContentCompletion.objects.all()
+    progress = CourseProgress.objects.all()
+    if user_ids is not None:
+        completions = completions.filter(user_id__in=user_ids)
+        progress = progress.filter(user_id__in=user_ids)
+    rows = (completions.order_by().values('user_id', course_id=F('content__course_id'))
+            .annotate(completed=Count('pk')))
+    with transaction.atomic():
+        progress.delete()
+        created = CourseProgress.objects.bulk_create([CourseProgress(**row) for row in rows], batch_size=1000)
+    return len(created)
+
+
+def completed_for(user):
+    """Subquery jumlah konten selesai ``user`` untuk course ``OuterRef('course')``, 0 kalau belum ada."""
+    rows = CourseProgress.objects.filter(user=user, course=OuterRef('course')).values('completed')[:1]
+    return Coalesce(Subquery(rows), 0)
+
+
+def courses_for(user):
+    """Course yang diikuti ``user`` beserta jumlah konten dan konten yang sudah diselesaikannya."""
+    return (CourseMember.objects.filter(user_id=user).order_by('course_id')
+            .values('course_id', name=F('course__name'), total_contents=Coalesce('course__stats__contents', 0),
+                    completed_contents=completed_for(user)))
+
+
+def percent(completed, total):
+    return round(min(completed, total) * 100 / total, 1) if total else 0.0
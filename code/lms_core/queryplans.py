@@ -0,0 +1,83 @@
+import re
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from lms_core import completions, enrollment, moderation, outline, progress, timeline
+from lms_core.pagination import encode_cursor, keyset_queryset
+from lms_core.planner import optimize
+from lms_core.serializers import CommentSerializer
+
+
+def hot_queries():
+    """
+    Query yang dijalankan view di jalur panas, dengan parameter contoh.
+
+    Querysetnya dibangun dari helper yang sama dengan yang dipanggil view,
+    jadi perubahan query di view ikut tercek. Id contoh tidak perlu ada di
+    database; yang dicek hanya plan-nya. Tambahkan entri di sini setiap
+    kali ada view baru yang membaca tabel besar.
+    """
+    now = timezone.now()
+    cursor = encode_cursor(now, 1)
+    approved = optimize(moderation.approved(1), CommentSerializer)
+    pending = optimize(moderation.pending(), CommentSerializer)
+    return {
+        'get_comments_for_content': keyset_queryset(approved, None, 51),
+        'get_comments_for_content (cursor)': keyset_queryset(approved, cursor, 51),
+        'pending_comments': keyset_queryset(pending, None, 51),
+        'pending_comments (cursor)': keyset_queryset(pending, cursor, 51),
+        'moderation claim': moderation.claimable(1, now).order_by('created_at', 'id')[:50],
+        'AvailableContentView': timeline.contents(),
+        'CourseContentListView': timeline.contents(1),
+        'released content rows': timeline.rows([1, 2]),
+        'CourseOutlineView': outline.outline_rows(1),
+        'enrollment check': enrollment.members(1, [1]),
+        'UserActivityDashboardView (courses)': progress.courses_for(1),
+        'UserActivityDashboardView (comments)': moderation.written_by(1),
+        'UserCompletedContentView': completions.completed_by(1),
+        'CompletionChangesView': keyset_queryset(completions.changes(1), cursor, 51, key='completed_at'),
+        'CompletionChangesView (deleted)': completions.tombstones(1, now, now),
+    }
+
+
+# SQLite: "SCAN tabel" tanpa "USING ... INDEX"; Postgres: "Seq Scan on tabel"
+SQLITE_FULL_SCAN = re.compile(r'\bSCAN (?!.*\bUSING\b.*\bINDEX\b)(\w+)')
+POSTGRES_FULL_SCAN = re.compile(r'\bSeq Scan on (\w+)')
+
+# Halaman keyset harus dibaca sesuai urutan index, bukan diurutkan ulang
+INDEX_ORDERED = {
+    'get_comments_for_content', 'get_comments_for_content (cursor)',
+    'pending_comments', 'pending_comments (cursor)',
+    'CourseOutlineView', 'CompletionChangesView', 'CompletionChangesView (deleted)', 'moderation claim',
+}
+SQLITE_SORT = re.compile(r'USE TEMP B-TREE FOR (?:ORDER BY|RIGHT PART OF ORDER BY)')
+POSTGRES_SORT = re.compile(r'\b(?:Incremental )?Sort\b')
+
+
+def explain(queryset):
+    if connection.vendor == 'postgresql':
+        # Tabel kecil selalu di-seq-scan oleh Postgres; matikan supaya seq scan
+        # hanya muncul kalau memang tidak ada index yang bisa dipakai
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            return queryset.explain()
+    return queryset.explain()
+
+
+def full_scans(plan):
+    """Nama tabel yang dibaca penuh menurut output EXPLAIN."""
+    pattern = POSTGRES_FULL_SCAN if connection.vendor == 'postgresql' else SQLITE_FULL_SCAN
+    return sorted(set(pattern.findall(plan)))
+
+
+def sorts(plan):
+    pattern = POSTGRES_SORT if connection.vendor == 'postgresql' else SQLITE_SORT
+    return bool(pattern.search(plan))
+
+
+def plan_problems(name, plan):
+    problems = [f"full scan {table}" for table in full_scans(plan)]
+    if name in INDEX_ORDERED and sorts(plan):
+        problems.append("sort di luar index")
+    return problems
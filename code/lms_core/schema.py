@@ -1,4 +1,4 @@
-from ninja import Schema
+from ninja import Field, Schema
 from typing import Optional
 from datetime import datetime
 
@@ -23,8 +23,8 @@ class CourseSchemaOut(Schema):
 
 class CourseMemberOut(Schema):
     id: int 
-    course_id: CourseSchemaOut
-    user_id: UserOut
+    course_id: CourseSchemaOut = Field(..., alias='course')
+    user_id: UserOut = Field(..., alias='user')
     roles: str
     # created_at: datetime
 
@@ -39,7 +39,7 @@ class CourseContentMini(Schema):
     id: int
     name: str
     description: str
-    course_id: CourseSchemaOut
+    course_id: CourseSchemaOut = Field(..., alias='course')
     created_at: datetime
     updated_at: datetime
 
@@ -50,7 +50,7 @@ class CourseContentFull(Schema):
     description: str
     video_url: Optional[str]
     file_attachment: Optional[str]
-    course_id: CourseSchemaOut
+    course_id: CourseSchemaOut = Field(..., alias='course')
     created_at: datetime
     updated_at: datetime
 
@@ -64,3 +64,12 @@ class CourseCommentOut(Schema):
 
 class CourseCommentIn(Schema):
     comment: str
+
+
+class CommentItemOut(Schema):
+    id: int
+    content_id: int = Field(..., alias='content_id_id')
+    member_id: int = Field(..., alias='member_id_id')
+    comment: str
+    created_at: datetime
+    is_approved: bool
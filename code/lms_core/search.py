@@ -0,0 +1,213 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from lms_core.models import Course, CourseContent
+
+# Satu tabel untuk course dan konten; id dokumen = pk * 2 + jenis, jadi hapus/update per baris
+# tetap lewat primary key (rowid di FTS5)
+TABLE = 'lms_search'
+KINDS = {'course': 0, 'content': 1}
+
+# Bobot ranking: nama jauh lebih penting daripada deskripsi
+NAME_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 1.0
+
+MAX_TERMS = 8
+BATCH_SIZE = 2000
+
+# Kalau jumlah dokumen yang cocok melebihi ini, hanya sekian dokumen cocok terbaru yang di-ranking:
+# term yang ada di hampir semua baris membuat bm25/ts_rank dihitung untuk jutaan baris. Di 1 juta
+# dokumen, ranking 100 ribu dokumen ~90 ms; term yang cocok di <= 10% dokumen tetap di-ranking penuh
+RANK_WINDOW = 100_000
+
+BACKENDS = {
+    'sqlite': {
+        'id': 'rowid',
+        'source': TABLE,
+        'match': f"{TABLE} MATCH %s",
+        'rank': f"bm25({TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})",
+    },
+    # Bobot A/B diset di kolom document (lihat migration 0023)
+    'postgresql': {
+        'id': 'id',
+        'source': f"{TABLE}, to_tsquery('simple', %s) AS query",
+        'match': "document @@ query",
+        'rank': "-ts_rank_cd(document, query)",
+    },
+}
+
+
+def available():
+    """Index full-text hanya ada di SQLite (FTS5) dan Postgres (tsvector + GIN)."""
+    return connection.vendor in BACKENDS
+
+
+def rank_window():
+    """``SEARCH_RANK_WINDOW`` dari settings; None berarti selalu ranking semua dokumen yang cocok."""
+    return getattr(settings, 'SEARCH_RANK_WINDOW', RANK_WINDOW)
+
+
+def doc_id(kind, pk):
+    return pk * 2 + KINDS[kind]
+
+
+def terms(query):
+    return re.findall(r'[^\W_]+', query.lower())[:MAX_TERMS]
+
+
+def match_expression(words):
+    """Semua kata harus ada; kata terakhir boleh berupa awalan (search-as-you-type)."""
+    if connection.vendor == 'postgresql':
+        return ' & '.join(words[:-1] + [f'{words[-1]}:*'])
+    return ' '.join([f'"{word}"' for word in words[:-1]] + [f'"{words[-1]}"*'])
+
+
+def _row(kind, obj):
+    course_id = obj.pk if kind == 'course' else obj.course_id
+    release_time = getattr(obj, 'release_time', None)
+    if release_time is not None:
+        release_time = connection.ops.adapt_datetimefield_value(release_time)
+    return doc_id(kind, obj.pk), course_id, release_time, obj.name or '', obj.description or ''
+
+
+def _write(rows):
+    id_column = BACKENDS[connection.vendor]['id']
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE {id_column} = %s", [(row[0],) for row in rows])
+        cursor.executemany(f"INSERT INTO {TABLE} ({id_column}, course_id, release_time, name, description) "
+                           f"VALUES (%s, %s, %s, %s, %s)", rows)
+
+
+def index(kind, obj):
+    index_many(kind, [obj])
+
+
+def index_many(kind, objs):
+    """Index ulang banyak objek sekaligus, misalnya setelah bulk_create yang tidak memicu signal."""
+    if available() and objs:
+        _write([_row(kind, obj) for obj in objs])
+
+
+def remove(kind, pk):
+    if available():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE {BACKENDS[connection.vendor]['id']} = %s", [doc_id(kind, pk)])
+
+
+FIELDS = {
+    'course': ['id', 'name', 'description'],
+    'content': ['id', 'course_id', 'name', 'description', 'release_time'],
+}
+
+
+def index_queryset(kind, queryset, batch_size=BATCH_SIZE):
+    """Index ulang semua objek ``queryset`` per batch, misalnya setelah UPDATE massal. Mengembalikan jumlahnya."""
+    if not available():
+        return 0
+    total, batch = 0, []
+    for obj in queryset.only(*FIELDS[kind]).order_by().iterator(chunk_size=batch_size):
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            index_many(kind, batch)
+            total += len(batch)
+            batch = []
+    index_many(kind, batch)
+    return total + len(batch)
+
+
+def rebuild(batch_size=BATCH_SIZE):
+    """Isi ulang index dari tabel course dan konten. Mengembalikan jumlah dokumen."""
+    if not available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+    total = (index_queryset('course', Course.objects.all(), batch_size)
+             + index_queryset('content', CourseContent.objects.all(), batch_size))
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"INSERT INTO {TABLE}({TABLE}) VALUES ('optimize')")
+        else:
+            cursor.execute(f"ANALYZE {TABLE}")
+    return total
+
+
+def search(query, kind=None, course_id=None, released_only=True, limit=20):
+    """List hasil ``search_results``."""
+    return search_results(query, kind, course_id, released_only, limit)['results']
+
+
+def search_results(query, kind=None, course_id=None, released_only=True, limit=20):
+    """
+    Course dan konten yang cocok dengan ``query``, urut dari yang paling relevan.
+
+    Mengembalikan dict ``results`` (list dict ``type``, ``id``,
+    ``course_id``, ``name`` dan ``rank``; makin kecil makin relevan) dan
+    ``truncated``. ``truncated`` True berarti dokumen yang cocok lebih
+    banyak dari ``rank_window()`` sehingga hanya yang terbaru yang
+    di-ranking; dokumen lama yang lebih relevan bisa tidak muncul.
+    Konten yang belum rilis disembunyikan kalau ``released_only``. Di
+    database selain SQLite dan Postgres dipakai ``icontains`` tanpa
+    ranking.
+    """
+    words = terms(query)
+    if not words:
+        return {'results': [], 'truncated': False}
+    if not available():
+        return {'results': _search_icontains(words, kind, course_id, released_only, limit), 'truncated': False}
+
+    backend = BACKENDS[connection.vendor]
+    id_column, source = backend['id'], backend['source']
+    conditions, params = [backend['match']], [match_expression(words)]
+    if kind is not None:
+        conditions.append(f"{id_column} %% 2 = %s")
+        params.append(KINDS[kind])
+    if course_id is not None:
+        conditions.append("course_id = %s")
+        params.append(course_id)
+    if released_only:
+        conditions.append("(release_time IS NULL OR release_time <= %s)")
+        params.append(connection.ops.adapt_datetimefield_value(timezone.now()))
+
+    window, row = rank_window(), None
+    with connection.cursor() as cursor:
+        if window is not None:
+            # Batas bawah jendela ranking: id dokumen cocok ke-window dari yang terbaru, kalau ada
+            cursor.execute(f"SELECT {id_column} FROM {source} WHERE {' AND '.join(conditions)} "
+                           f"ORDER BY {id_column} DESC LIMIT 1 OFFSET %s", params + [window])
+            row = cursor.fetchone()
+        if row is not None:
+            conditions.append(f"{id_column} >= %s")
+            params.append(row[0])
+        cursor.execute(f"SELECT {id_column}, course_id, name, {backend['rank']} AS rank FROM {source} "
+                       f"WHERE {' AND '.join(conditions)} ORDER BY rank, {id_column} LIMIT %s", params + [limit])
+        rows = cursor.fetchall()
+    results = [{'type': 'course' if doc % 2 == KINDS['course'] else 'content', 'id': doc // 2,
+                'course_id': course, 'name': name, 'rank': rank}
+               for doc, course, name, rank in rows]
+    return {'results': results, 'truncated': row is not None}
+
+
+def _search_icontains(words, kind, course_id, released_only, limit):
+    results = []
+    for name, model in (('course', Course), ('content', CourseContent)):
+        if kind not in (None, name):
+            continue
+        course_field = 'pk' if name == 'course' else 'course_id'
+        queryset = model.objects.all()
+        for word in words:
+            queryset = queryset.filter(Q(name__icontains=word) | Q(description__icontains=word))
+        if course_id is not None:
+            queryset = queryset.filter(**{course_field: course_id})
+        if released_only and name == 'content':
+            queryset = queryset.filter(release_time__lte=timezone.now())
+        for pk, course, title in queryset.order_by('pk').values_list('pk', course_field, 'name')[:limit]:
+            results.append({'type': name, 'id': pk, 'course_id': course, 'name': title, 'rank': 0.0})
+    return results[:limit]
+
+
+def matching_ids(kind, query, limit=1000):
+    """Pk ``kind`` yang cocok dengan ``query``, paling relevan dulu; dipakai pencarian admin."""
+    return [hit['id'] for hit in search(query, kind=kind, released_only=False, limit=limit)]
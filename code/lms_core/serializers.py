@@ -1,27 +1,46 @@
 from rest_framework import serializers
 from rest_framework.response import Response
 from django.contrib.auth.models import User
+from django.db.models import Q
 from .models import Comment
-from .models import CourseMember
-from .models import CourseContent, ContentCompletion
+from .models import CourseMember, ROLE_OPTIONS
+from .models import CourseContent, ContentCompletion, CertificateJob
 from lms_core.models import Course
 from rest_framework.exceptions import ValidationError
+from .hashing import hash_passwords
+from .completions import bulk_complete
+from .enrollment import EnrollmentError, bulk_enroll, enroll
 
 
 
 class CommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
-        fields = ['content_id', 'member_id', 'comment', 'created_at', 'is_approved']
+        fields = ['id', 'content_id', 'member_id', 'comment', 'created_at', 'is_approved']
         read_only_fields = ['member_id', 'created_at', 'is_approved']
         
 
 
 
+class BulkRegisterSerializer(serializers.ListSerializer):
+    def validate(self, attrs):
+        usernames = [item['username'] for item in attrs]
+        if len(usernames) != len(set(usernames)):
+            raise serializers.ValidationError("Username dalam satu batch tidak boleh duplikat.")
+        return attrs
+
+    def create(self, validated_data):
+        # Hash password paralel di semua core, lalu satu bulk_create
+        passwords = hash_passwords(item.pop('password') for item in validated_data)
+        users = [User(password=password, **item) for item, password in zip(validated_data, passwords)]
+        return User.objects.bulk_create(users)
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'password', 'email', 'first_name', 'last_name']
+        list_serializer_class = BulkRegisterSerializer
         
 
     def create(self, validated_data):
@@ -38,30 +57,69 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         user = self.context['request'].user
         course = validated_data['course']
-        
-        # Cek apakah user sudah terdaftar
-        if CourseMember.objects.filter(user=user, course=course).exists():
-            raise serializers.ValidationError("User sudah terdaftar di course ini.")
-        
-        # Cek batas maksimal peserta
-        enrolled_count = CourseMember.objects.filter(course=course).count()
-        if enrolled_count >= course.max_participants:
-            raise serializers.ValidationError("Kuota peserta untuk course ini sudah penuh.")
+        try:
+            return enroll(user, course, roles='std')
+        except EnrollmentError as e:
+            raise serializers.ValidationError(str(e))
 
 
-        return CourseMember.objects.create(
-            user=user,
-            course=course,
-            roles='std'
-        )
 
+class UserIdentifierField(serializers.Field):
+    """Angka dibaca sebagai id user, teks sebagai username."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, int) and not isinstance(data, bool):
+            return data
+        if isinstance(data, str) and data.strip():
+            return data.strip()
+        raise serializers.ValidationError("Harus berupa id user atau username.")
+
+    def to_representation(self, value):
+        return value
+
+
+class BulkEnrollmentSerializer(serializers.Serializer):
+    course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
+    users = serializers.ListField(child=UserIdentifierField(), allow_empty=False, max_length=5000)
+    roles = serializers.ChoiceField(choices=ROLE_OPTIONS, default='std')
+
+    def create(self, validated_data):
+        course, identifiers = validated_data['course'], validated_data['users']
+        ids = {item for item in identifiers if isinstance(item, int)}
+        usernames = {item for item in identifiers if isinstance(item, str)}
+        found = User.objects.filter(Q(pk__in=ids) | Q(username__in=usernames)).only('id', 'username')
+        by_id = {user.pk: user for user in found}
+        by_username = {user.username: user for user in by_id.values()}
+
+        resolved = {}
+        for item in identifiers:
+            user = by_id.get(item) if isinstance(item, int) else by_username.get(item)
+            if user is not None:
+                resolved[item] = user
+        try:
+            outcomes = bulk_enroll(course, resolved.values(), roles=validated_data['roles'])
+        except EnrollmentError as e:
+            raise serializers.ValidationError(str(e))
+
+        results, seen = [], set()
+        for item in identifiers:
+            user = resolved.get(item)
+            if user is None:
+                result = {'user': item, 'user_id': None, 'status': 'not_found'}
+            elif user.pk in seen:
+                result = {'user': item, 'user_id': user.pk, 'status': 'duplicate'}
+            else:
+                result = {'user': item, 'user_id': user.pk, 'status': outcomes[user.pk]}
+                seen.add(user.pk)
+            results.append(result)
+        return results
 
 
 class CourseContentSerializer(serializers.ModelSerializer):
     class Meta:
         model = CourseContent
-        fields = ['id', 'title', 'body', 'release_time']
-        fields = '__all__' 
+        # path hanya untuk urutan pohon konten (lms_core.outline), bukan untuk klien
+        exclude = ['path']
 
 class CourseMemberSerializer(serializers.ModelSerializer):
     class Meta:
@@ -74,7 +132,29 @@ class ContentCompletionSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'content', 'completed_at']
         read_only_fields = ['id', 'user', 'completed_at']
 
+class ModerationClaimSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=50)
+
+
+class ModerationIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=5000)
+
+
+class CompletionBatchSerializer(serializers.Serializer):
+    content_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False,
+                                        max_length=1000)
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        outcomes = bulk_complete(user, validated_data['content_ids'])
+        return [{'content': pk, 'status': outcome} for pk, outcome in outcomes.items()]
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name']  # atau sesuai field user kamu
+
+class CertificateJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CertificateJob
+        fields = ['id', 'course', 'status', 'attempts', 'error', 'created_at', 'updated_at']
@@ -0,0 +1,112 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from lms_core import analytics, completions, progress, search, stats, timeline
+from lms_core.models import Comment, ContentCompletion, Course, CourseContent, CourseMember, CourseStats
+
+
+@receiver(post_save, sender=Course)
+def course_saved(sender, instance, created, **kwargs):
+    if created:
+        CourseStats.objects.get_or_create(course=instance)
+    analytics.invalidate(instance.pk)
+    search.index('course', instance)
+
+
+@receiver(post_delete, sender=Course)
+def course_deleted(sender, instance, **kwargs):
+    search.remove('course', instance.pk)
+
+
+@receiver(post_save, sender=CourseMember)
+def member_saved(sender, instance, created, **kwargs):
+    if created and getattr(instance, '_seat_claimed', False):
+        # Kursi sudah diambil lewat lms_core.enrollment.claim_seats
+        analytics.invalidate(instance.course_id)
+    elif created:
+        stats.bump(instance.course_id, students=1)
+
+
+@receiver(post_delete, sender=CourseMember)
+def member_deleted(sender, instance, **kwargs):
+    stats.bump(instance.course_id, students=-1)
+
+
+@receiver(post_save, sender=CourseContent)
+def content_saved(sender, instance, created, **kwargs):
+    if created:
+        stats.bump(instance.course_id, contents=1)
+        course_id = instance.course_id
+    else:
+        # Konten lama bisa saja dipindah ke course lain, jadi semua timeline dibuang
+        course_id = None
+    search.index('content', instance)
+    # Setelah commit, supaya timeline tidak dibangun ulang dari data yang belum terlihat
+    transaction.on_commit(lambda: timeline.invalidate(course_id))
+
+
+@receiver(post_delete, sender=CourseContent)
+def content_deleted(sender, instance, **kwargs):
+    stats.bump(instance.course_id, contents=-1)
+    search.remove('content', instance.pk)
+    transaction.on_commit(lambda: timeline.invalidate(instance.course_id))
+
+
+@receiver(pre_save, sender=Comment)
+def comment_saving(sender, instance, **kwargs):
+    # Status dan course lama dicatat supaya comment_saved tahu counter mana yang berubah
+    instance._stored_state = None
+    if not instance._state.adding:
+        instance._stored_state = (Comment.objects.filter(pk=instance.pk)
+                                  .values_list('is_approved', 'content_id__course').first())
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    course_id = stats.content_course_id(instance.content_id_id)
+    stored = getattr(instance, '_stored_state', None)
+    if created or stored is None:
+        stats.bump(course_id, comments=1, approved_comments=int(instance.is_approved))
+        return
+    was_approved, old_course_id = stored
+    if old_course_id != course_id:
+        # Komentar dipindah ke konten di course lain
+        stats.bump(old_course_id, comments=-1, approved_comments=-int(was_approved))
+        stats.bump(course_id, comments=1, approved_comments=int(instance.is_approved))
+    elif was_approved != instance.is_approved:
+        stats.bump(course_id, approved_comments=int(instance.is_approved) - int(was_approved))
+    else:
+        # Counter tidak berubah, tapi setiap penulisan komentar tetap membuang cache analytics
+        analytics.invalidate(course_id)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    # Saat konten dihapus, komentar ikut terhapus lebih dulu sehingga kontennya masih bisa dibaca
+    course_id = stats.content_course_id(instance.content_id_id)
+    if course_id is not None:
+        stats.bump(course_id, comments=-1, approved_comments=-int(instance.is_approved))
+
+
+@receiver(post_save, sender=ContentCompletion)
+def completion_saved(sender, instance, created, **kwargs):
+    if created:
+        course_id = stats.content_course_id(instance.content_id)
+        stats.bump(course_id, completions=1)
+        progress.bump(instance.user_id, course_id, 1)
+
+
+@receiver(post_delete, sender=ContentCompletion)
+def completion_deleted(sender, instance, origin=None, **kwargs):
+    # Saat user dihapus, CourseProgress-nya sudah ikut terhapus; bump akan membuatnya lagi.
+    # Tombstone juga tidak perlu: user itu tidak akan sync lagi
+    user_deleted = getattr(origin, 'model', type(origin)) is User
+    if not user_deleted:
+        completions.record_deletions([(instance.user_id, instance.content_id)])
+    course_id = stats.content_course_id(instance.content_id)
+    if course_id is not None:
+        stats.bump(course_id, completions=-1)
+        if not user_deleted:
+            progress.bump(instance.user_id, course_id, -1)
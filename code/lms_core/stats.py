@@ -0,0 +1,87 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from lms_core import analytics
+from lms_core.models import Comment, ContentCompletion, Course, CourseContent, CourseMember, CourseStats
+
+COUNTERS = ['students', 'contents', 'comments', 'approved_comments', 'completions']
+
+
+def _count(queryset, key):
+    subquery = queryset.order_by().values(key).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(subquery), 0)
+
+
+def counter_annotations():
+    """Subquery COUNT per course (OuterRef('pk')), tanpa join yang saling mengalikan."""
+    course = OuterRef('pk')
+    return {
+        'students': _count(CourseMember.objects.filter(course=course), 'course'),
+        'contents': _count(CourseContent.objects.filter(course=course), 'course'),
+        'comments': _count(Comment.objects.filter(content_id__course=course), 'content_id__course'),
+        'approved_comments': _count(Comment.objects.filter(content_id__course=course, is_approved=True),
+                                    'content_id__course'),
+        'completions': _count(ContentCompletion.objects.filter(content__course=course), 'content__course'),
+    }
+
+
+def bump(course_id, **deltas):
+    """
+    Tambah/kurangi counter satu course dengan UPDATE ... SET x = x + n.
+
+    Kalau baris statistik belum ada, baris dibuat dari hitungan ulang data
+    course tersebut (perubahan yang memicu bump sudah ikut terhitung).
+    """
+    updates = {name: F(name) + delta for name, delta in deltas.items() if delta}
+    if course_id is None or not updates:
+        return
+    analytics.invalidate(course_id)
+    if CourseStats.objects.filter(course_id=course_id).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            rebuild(Course.objects.filter(pk=course_id))
+    except IntegrityError:
+        CourseStats.objects.filter(course_id=course_id).update(**updates)
+
+
+def bump_many(name, deltas):
+    """
+    Versi ``bump`` untuk satu counter di banyak course: ``deltas`` berisi ``{course_id: n}``.
+
+    Semua course dinaikkan dengan satu UPDATE ... CASE; course yang belum
+    punya baris statistik dihitung ulang.
+    """
+    deltas = {course_id: delta for course_id, delta in deltas.items() if course_id is not None and delta}
+    if not deltas:
+        return
+    for course_id in deltas:
+        analytics.invalidate(course_id)
+    with transaction.atomic():
+        rows = CourseStats.objects.select_for_update().filter(course_id__in=deltas)
+        existing = set(rows.values_list('course_id', flat=True))
+        if existing:
+            delta = Case(*[When(course_id=course_id, then=Value(deltas[course_id])) for course_id in existing],
+                         default=Value(0))
+            CourseStats.objects.filter(course_id__in=existing).update(**{name: F(name) + delta})
+        missing = deltas.keys() - existing
+        if missing:
+            rebuild(Course.objects.filter(pk__in=missing))
+
+
+def content_course_id(content_id):
+    return CourseContent.objects.filter(pk=content_id).values_list('course_id', flat=True).first()
+
+
+def rebuild(courses=None):
+    """Hitung ulang CourseStats dari data asli. Mengembalikan jumlah course yang diperbarui."""
+    courses = Course.objects.all() if courses is None else courses
+    rows = courses.order_by().annotate(**counter_annotations()).values('pk', *COUNTERS)
+    stats = [CourseStats(course_id=row.pop('pk'), **row) for row in rows]
+    CourseStats.objects.bulk_create(stats, batch_size=1000, update_conflicts=True,
+                                    unique_fields=['course'], update_fields=COUNTERS)
+    # Rebuild biasanya dipakai setelah bulk write yang tidak memicu signal
+    for course_stats in stats:
+        analytics.invalidate(course_stats.course_id)
+    return len(stats)
@@ -0,0 +1,834 @@
+import base64
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import tracemalloc
+import zlib
+from datetime import date, timedelta
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ninja.testing import TestClient
+from reportlab import rl_config
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from lms_core import analytics, certificates, completions, exports, hashing, moderation, search, stats, timeline
+from lms_core.api import comments_router
+from lms_core.enrollment import AlreadyEnrolled, CourseFull, bulk_enroll, enroll
+from lms_core.fastserializers import values_serializer
+from lms_core.importer import BulkImporter
+from lms_core.jobs import LEASE, claim_jobs, enqueue_certificate, run_jobs
+from lms_core.jsonstream import iter_json_array
+from lms_core.metrics import budget_for
+from lms_core.models import (CertificateJob, Comment, CompletionTombstone, ContentCompletion, Course, CourseContent,
+                              CourseMember, CourseProgress, CourseStats, content_path)
+from lms_core.pagination import encode_cursor
+from lms_core.planner import optimize
+from lms_core.queryplans import explain, hot_queries, plan_problems
+from lms_core.schema import CourseCommentOut, CourseMemberOut
+from lms_core.serializers import CommentSerializer, ContentCompletionSerializer, CourseContentSerializer
+from lms_core.views import (AvailableContentView, BulkEnrollmentView, CertificateJobDownloadView, CompletionBatchView,
+                            CompletionChangesView, CourseAnalyticsListView, CourseProgressExportView, CourseContentListView, CourseOutlineView, ModerationApproveView,
+                            ModerationRejectView, UserActivityDashboardView, UserCompletedContentView,
+                            get_comments_for_content, pending_comments)
+
+
+class JsonStreamTests(TestCase):
+    def parse(self, text, buffer_size=8):
+        return list(iter_json_array(io.StringIO(text), buffer_size=buffer_size))
+
+    def test_reads_records_across_buffer_boundaries(self):
+        records = [{'name': f'konten {i}', 'tags': [i, None, True]} for i in range(50)]
+        self.assertEqual(self.parse(json.dumps(records)), records)
+        self.assertEqual(self.parse(' [ ] \n'), [])
+
+    def test_rejects_invalid_arrays(self):
+        for text in ['{}', '[1, 2', '[1, 2,]', '[1 2]', '[1] 2', '[1]]', '[] []']:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.parse(text)
+
+
+class PasswordHashingTests(TestCase):
+    def batch_sizes(self, passwords, workers):
+        sizes = []
+
+        def run(fn, batches, workers):
+            sizes.append([len(batch) for batch in batches])
+            return []
+
+        with mock.patch.object(hashing, 'imap_ordered', run):
+            list(hashing.imap_passwords(passwords, workers))
+        return sizes[0]
+
+    def test_short_input_is_spread_over_workers(self):
+        self.assertEqual(self.batch_sizes(['rahasia'] * 10, workers=4), [3, 3, 3, 1])
+
+    def test_long_generator_uses_full_batches(self):
+        self.assertEqual(self.batch_sizes(iter(['rahasia'] * 300), workers=4), [32] * 9 + [12])
+
+
+class ImportMemoryTests(TestCase):
+    def import_contents(self, rows):
+        """Import ``rows`` konten dari contents.json sintetis, kembalikan puncak alokasi (byte)."""
+        with tempfile.TemporaryDirectory() as data_dir:
+            with open(os.path.join(data_dir, 'contents.json'), 'w') as f:
+                f.write('[')
+                for i in range(rows):
+                    f.write(',\n' if i else '\n')
+                    json.dump({'course_id': self.course.pk, 'name': f'Konten {i}', 'description': 'x' * 1000}, f)
+                f.write('\n]')
+            importer = BulkImporter(data_dir, chunk_size=200, stdout=io.StringIO(), hash_workers=0)
+            tracemalloc.start()
+            try:
+                stats = importer.import_entity('contents')
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        self.assertEqual(stats.created, rows)
+        CourseContent.objects.all().delete()
+        return peak
+
+    def test_peak_memory_does_not_grow_with_input(self):
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        small, large = self.import_contents(5000), self.import_contents(20000)
+        # 4x lebih banyak baris (~15 MiB lebih besar); parser yang memuat seluruh file naik ~4x.
+        # Instance CourseContent punya siklus referensi (FieldFile) dan baru dibebaskan GC, jadi
+        # puncaknya bergeser sesuai jadwal GC dan batasnya diberi ruang
+        self.assertLess(large, small * 2, f"puncak memori {small} -> {large} byte")
+
+
+class ImportRerunTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = tmp.name
+        self.manifest = os.path.join(self.data_dir, '.import-manifest.json')
+        self.write_data(price=100)
+
+    def write_data(self, price, teacher_id=None):
+        with open(os.path.join(self.data_dir, 'user-data.csv'), 'w') as f:
+            f.write("firstname,lastname,email,password,username\n"
+                    "Guru,Satu,guru@example.com,rahasia,guru\n"
+                    "Siswa,Dua,siswa@example.com,rahasia,siswa\n")
+        with open(os.path.join(self.data_dir, 'course-data.csv'), 'w') as f:
+            f.write("name,description,price,teacher\n"
+                    f"Aljabar,-,{price},{teacher_id or self.next_user_id}\n")
+        with open(os.path.join(self.data_dir, 'contents.json'), 'w') as f:
+            json.dump([{'course_id': 1, 'name': 'Bab 1'}, {'course_id': 1, 'name': 'Bab 2'}], f)
+
+    @property
+    def next_user_id(self):
+        # Id user hasil import berikutnya: sequence tidak di-reset di antara test
+        return (User.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+
+    def run_import(self, **options):
+        out = io.StringIO()
+        call_command('import_data', data_dir=self.data_dir, only=['users', 'courses', 'contents'],
+                     hash_workers=0, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_after_flush_imports_again(self):
+        self.run_import()
+        self.assertEqual((User.objects.count(), Course.objects.count(), CourseContent.objects.count()), (2, 1, 2))
+        self.assertFalse(os.path.exists(self.manifest))
+
+        call_command('flush', interactive=False, verbosity=0)
+        self.write_data(price=100)
+        output = self.run_import()
+        self.assertNotIn('already imported', output)
+        self.assertEqual((User.objects.count(), Course.objects.count(), CourseContent.objects.count()), (2, 1, 2))
+
+    def test_interrupted_run_resumes_from_manifest(self):
+        self.run_import()
+        importer = BulkImporter(self.data_dir, stdout=io.StringIO(), hash_workers=0, manifest=self.manifest)
+        importer.manifest.commit('contents', os.path.join(self.data_dir, 'contents.json'), record=2, batch=1,
+                                 done=True)
+        self.assertEqual(importer.import_entity('contents').written, 0)
+        # Checkpoint run biasa tidak berlaku untuk upsert
+        upsert = BulkImporter(self.data_dir, stdout=io.StringIO(), hash_workers=0, manifest=self.manifest,
+                              upsert=True)
+        self.assertEqual(upsert.import_entity('contents').updated, 2)
+
+    def test_contents_get_paths_without_a_rebuild(self):
+        self.run_import()
+        first, second = CourseContent.objects.order_by('pk')
+        self.assertEqual([first.path, second.path], [content_path('', first.pk), content_path('', second.pk)])
+        second.parent_id = first
+        second.save()
+        self.run_import(upsert=True)
+        self.assertEqual(CourseContent.objects.get(pk=second.pk).path, content_path(first.path, second.pk))
+
+    def test_upsert_updates_existing_rows(self):
+        self.run_import()
+        self.write_data(price=250, teacher_id=User.objects.get(username='guru').pk)
+        output = self.run_import(upsert=True)
+        self.assertIn('courses: 0 created, 1 updated', output)
+        self.assertIn('contents: 0 created, 2 updated', output)
+        self.assertIn('0 baris baru, 5 diperbarui', output)
+        self.assertEqual(Course.objects.get().price, 250)
+        self.assertFalse(os.path.exists(self.manifest))
+
+
+class AnalyticsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        self.content = CourseContent.objects.create(course=self.course, name='konten')
+        self.member = CourseMember.objects.create(course=self.course, user=User.objects.create(username='siswa'))
+
+    def test_warm_hit_runs_no_queries(self):
+        with self.assertNumQueries(1):
+            cold = analytics.course_analytics(self.course.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(analytics.course_analytics(self.course.pk), cold)
+
+    def test_new_comment_invalidates(self):
+        self.assertEqual(analytics.course_analytics(self.course.pk)['total_comments'], 0)
+        Comment.objects.create(content_id=self.content, member_id=self.member, comment='-')
+        self.assertEqual(analytics.course_analytics(self.course.pk)['total_comments'], 1)
+
+    def test_every_comment_save_invalidates(self):
+        comment = Comment.objects.create(content_id=self.content, member_id=self.member, comment='-')
+        for change in ({'comment': 'diubah'}, {'is_approved': True}):
+            with self.subTest(change=change):
+                version = analytics.course_version(self.course.pk)
+                for field, value in change.items():
+                    setattr(comment, field, value)
+                comment.save()
+                self.assertNotEqual(analytics.course_version(self.course.pk), version)
+        self.assertEqual(analytics.course_analytics(self.course.pk)['approved_comments'], 1)
+
+
+class CommentStatsSignalTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        content = CourseContent.objects.create(course=self.course, name='konten')
+        member = CourseMember.objects.create(course=self.course, user=User.objects.create(username='siswa'))
+        self.comment = Comment.objects.create(content_id=content, member_id=member, comment='-')
+
+    def counters(self, course=None):
+        return CourseStats.objects.values_list('comments', 'approved_comments').get(course=course or self.course)
+
+    def test_approving_through_save_updates_counter(self):
+        self.assertEqual(self.counters(), (1, 0))
+        self.comment.is_approved = True
+        self.comment.save()
+        self.assertEqual(self.counters(), (1, 1))
+        self.comment.save()
+        self.assertEqual(self.counters(), (1, 1))
+        self.comment.is_approved = False
+        self.comment.save()
+        self.assertEqual(self.counters(), (1, 0))
+
+    def test_moving_to_another_course_moves_counters(self):
+        other = Course.objects.create(name='d', description='-', price=0, teacher=self.course.teacher)
+        self.comment.content_id = CourseContent.objects.create(course=other, name='konten')
+        self.comment.is_approved = True
+        self.comment.save()
+        self.assertEqual(self.counters(), (0, 0))
+        self.assertEqual(self.counters(other), (1, 1))
+        self.assertEqual(stats.rebuild(), 2)
+        self.assertEqual([self.counters(), self.counters(other)], [(0, 0), (1, 1)])
+
+
+class EnrollmentTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher, max_participants=2)
+        self.users = [User.objects.create(username=f'siswa{i}') for i in range(3)]
+
+    def test_enroll_without_stats_row_counts_member_once(self):
+        CourseStats.objects.filter(course=self.course).delete()
+        enroll(self.users[0], self.course)
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 1)
+        enroll(self.users[1], self.course)
+        with self.assertRaises(CourseFull):
+            enroll(self.users[2], self.course)
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 2)
+        self.assertEqual(CourseMember.objects.filter(course=self.course).count(), 2)
+
+    def test_already_enrolled_wins_over_full(self):
+        enroll(self.users[0], self.course)
+        enroll(self.users[1], self.course)
+        with self.assertRaises(AlreadyEnrolled):
+            enroll(self.users[0], self.course)
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 2)
+
+    def bulk(self, users, as_user=None):
+        request = APIRequestFactory().post('/', {'course': self.course.pk, 'users': users}, format='json')
+        force_authenticate(request, user=as_user or self.course.teacher)
+        response = BulkEnrollmentView.as_view()(request)
+        response.render()
+        return response
+
+    def test_bulk_admits_up_to_capacity(self):
+        enroll(self.users[0], self.course)
+        extra = User.objects.create(username='siswa-extra')
+        response = self.bulk([self.users[0].pk, self.users[1].username, self.users[1].pk, 'tidak-ada',
+                              self.users[2].pk, extra.pk])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([r['status'] for r in response.data['results']],
+                         ['already_enrolled', 'enrolled', 'duplicate', 'not_found', 'course_full', 'course_full'])
+        self.assertEqual(response.data['enrolled'], 1)
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 2)
+        self.assertEqual(set(CourseMember.objects.filter(course=self.course).values_list('user', flat=True)),
+                         {self.users[0].pk, self.users[1].pk})
+
+    def test_bulk_without_stats_row_counts_once(self):
+        CourseStats.objects.filter(course=self.course).delete()
+        response = self.bulk([user.pk for user in self.users])
+        self.assertEqual([r['status'] for r in response.data['results']], ['enrolled', 'enrolled', 'course_full'])
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 2)
+
+    def test_bulk_retries_when_a_member_appears_after_the_check(self):
+        # Member dari jalur yang tidak lewat kunci CourseStats muncul tepat sebelum insert. Di sini
+        # ia ikut di-rollback bersama percobaan pertama; yang diuji: tidak ada kursi yang dihitung dobel
+        original, calls = CourseMember.objects.bulk_create, []
+
+        def racing_bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 1:
+                original([CourseMember(course=self.course, user=self.users[1])])
+            return original(objs, *args, **kwargs)
+
+        with mock.patch.object(CourseMember.objects, 'bulk_create', racing_bulk_create):
+            outcomes = bulk_enroll(self.course, self.users[:2])
+        self.assertEqual(calls, [2, 2])
+        self.assertEqual(outcomes, {self.users[0].pk: 'enrolled', self.users[1].pk: 'enrolled'})
+        self.assertEqual(CourseStats.objects.get(course=self.course).students, 2)
+        self.assertEqual(CourseMember.objects.filter(course=self.course).count(), 2)
+
+    def test_bulk_requires_teacher_or_staff(self):
+        response = self.bulk([self.users[0].pk], as_user=self.users[1])
+        self.assertEqual(response.status_code, 403)
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        # Sama dengan manage.py check_query_plans, tapi di database test supaya regresi menggagalkan build
+        for name, queryset in hot_queries().items():
+            with self.subTest(name):
+                plan = explain(queryset)
+                self.assertEqual(plan_problems(name, plan), [], plan)
+
+
+class QueryCountTests(TestCase):
+    """Jumlah query list endpoint tidak bertambah seiring jumlah baris dan tidak melewati @query_budget view-nya."""
+
+    # Lebih kecil dari data besar, jadi jalur halaman berikutnya (cursor + URL next) ikut terukur
+    PAGE_SIZE = 20
+
+    def setUp(self):
+        cache.clear()
+
+    def seed(self, size):
+        """Buat satu course dengan ``size`` konten, peserta, komentar dan completion."""
+        prefix = f"qc-{size}"
+        teacher = User.objects.create(username=f"{prefix}-teacher")
+        admin = User.objects.create(username=f"{prefix}-admin", is_staff=True)
+        course = Course.objects.create(name=prefix, description="-", price=0, teacher=teacher,
+                                       max_participants=size)
+        users = User.objects.bulk_create([User(username=f"{prefix}-{i}") for i in range(size)])
+        members = CourseMember.objects.bulk_create([CourseMember(course=course, user=user) for user in users])
+        contents = CourseContent.objects.bulk_create([CourseContent(course=course, name=f"konten {i}")
+                                                      for i in range(size)])
+        Comment.objects.bulk_create([Comment(content_id=contents[0], member_id=member, comment="-",
+                                             is_approved=approved)
+                                     for member in members for approved in (True, False)])
+        ContentCompletion.objects.bulk_create([ContentCompletion(user=users[0], content=content)
+                                               for content in contents])
+        # bulk_create tidak memicu signal; ukur jalur timeline yang dibangun dari database
+        timeline.invalidate()
+        return {'course': course, 'content': contents[0], 'user': users[0], 'admin': admin}
+
+    def checks(self, data):
+        factory = APIRequestFactory()
+        ninja = TestClient(comments_router)
+
+        def drf(view, user=None, **kwargs):
+            request = factory.get('/', {'page_size': self.PAGE_SIZE})
+            if user is not None:
+                force_authenticate(request, user=user)
+            response = view(request, **kwargs)
+            response.render()
+            self.assertEqual(response.status_code, 200, response.content)
+            return response
+
+        # nama -> (view yang dipanggil, atau None, dan cara memanggilnya)
+        return {
+            'get_comments_for_content': (get_comments_for_content, lambda view: drf(
+                view, content_id=data['content'].id)),
+            'pending_comments': (pending_comments, lambda view: drf(view, user=data['admin'])),
+            'AvailableContentView': (AvailableContentView.as_view(), drf),
+            'CourseContentListView': (CourseContentListView.as_view(), lambda view: drf(
+                view, course_id=data['course'].id)),
+            'UserCompletedContentView': (UserCompletedContentView.as_view(), lambda view: drf(
+                view, user=data['user'])),
+            'CompletionChangesView': (CompletionChangesView.as_view(), lambda view: drf(view, user=data['user'])),
+            'CourseOutlineView': (CourseOutlineView.as_view(), lambda view: drf(
+                view, user=data['admin'], course_id=data['course'].id)),
+            'UserActivityDashboardView': (UserActivityDashboardView.as_view(), lambda view: drf(
+                view, user=data['user'])),
+            'CourseAnalyticsListView': (CourseAnalyticsListView.as_view(), drf),
+            'apiv1 comments/content': (None, lambda view: ninja.get(
+                f"/content/{data['content'].id}?page_size={self.PAGE_SIZE}")),
+            'CourseCommentOut (nested)': (None, lambda view: [
+                CourseCommentOut.from_orm(comment).model_dump()
+                for comment in optimize(Comment.objects.filter(content_id=data['content']), CourseCommentOut)]),
+            'CourseMemberOut (nested)': (None, lambda view: [
+                CourseMemberOut.from_orm(member).model_dump()
+                for member in optimize(CourseMember.objects.filter(course=data['course']), CourseMemberOut)]),
+        }
+
+    def test_query_counts_are_constant_and_within_budget(self):
+        counts = {}
+        for name, (view, check) in self.checks(self.seed(3)).items():
+            with CaptureQueriesContext(connection) as queries:
+                check(view)
+            counts[name] = len(queries)
+        # Autentikasi dipaksa tanpa query di sini, jadi budget di atas kebutuhan ini
+        for name, (view, check) in self.checks(self.seed(30)).items():
+            with self.subTest(name):
+                with self.assertNumQueries(counts[name]):
+                    check(view)
+                if view is not None and budget_for(view) is not None:
+                    self.assertLessEqual(counts[name], budget_for(view))
+
+
+class MetricsViewTests(TestCase):
+    def test_requires_staff_or_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.force_login(User.objects.create(username='siswa'))
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.force_login(User.objects.create(username='admin', is_staff=True))
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(METRICS_TOKEN='rahasia')
+    def test_bearer_token(self):
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer salah').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer rahasia')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'lms_request_duration_seconds', response.content)
+
+
+class SearchRankWindowTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        # Konten terlama paling relevan (cocok di nama), yang lebih baru hanya cocok di deskripsi
+        self.best = CourseContent.objects.create(course=course, name='aljabar', description='-')
+        for i in range(3):
+            CourseContent.objects.create(course=course, name=f'konten {i}', description='aljabar')
+
+    def test_window_reports_truncation(self):
+        with override_settings(SEARCH_RANK_WINDOW=2):
+            found = search.search_results('aljabar', kind='content')
+        self.assertTrue(found['truncated'])
+        self.assertNotIn(self.best.pk, [r['id'] for r in found['results']])
+
+    def test_wide_window_ranks_all_matches(self):
+        for window in (10, None):
+            with self.subTest(window=window), override_settings(SEARCH_RANK_WINDOW=window):
+                found = search.search_results('aljabar', kind='content')
+                self.assertFalse(found['truncated'])
+                self.assertEqual(found['results'][0]['id'], self.best.pk)
+                self.assertEqual(len(found['results']), 4)
+
+
+class CertificateRenderTests(TestCase):
+    def pdf_streams(self, pdf):
+        # Stream reportlab: ASCII85 lalu Flate; stream gambar dilewati
+        streams = []
+        for raw in re.findall(rb'stream\r?\n(.*?)endstream', pdf, re.S):
+            try:
+                streams.append(zlib.decompress(base64.a85decode(raw.strip().removesuffix(b'~>'))))
+            except (ValueError, zlib.error):
+                continue
+        return b'\n'.join(streams)
+
+    def render(self):
+        return certificates.render_certificate('siswa', 'Aljabar Linear', 'Vektor dan matriks', '1 Januari 2025')
+
+    def test_certificate_contains_static_and_personal_text(self):
+        certificates.static_layer_code.cache_clear()
+        for attempt in range(2):
+            with self.subTest(attempt=attempt):
+                content = self.pdf_streams(self.render())
+                for text in (b'SERTIFIKAT PENYELESAIAN', b'Aljabar Linear', b'Vektor dan matriks',
+                             b'AKMAL ZULFIKAR', b'(siswa)', b'Semarang, 1 Januari 2025'):
+                    self.assertIn(text, content)
+
+    def test_cached_layer_matches_drawing_it(self):
+        # Operator yang disalin dari cache harus sama persis dengan menggambar layer-nya langsung
+        with mock.patch.object(rl_config, 'invariant', 1):
+            cached = self.render()
+            with mock.patch.object(certificates, 'draw_static_layer',
+                                   lambda p, name, description: certificates._draw_static(p, name, description)):
+                drawn = self.render()
+        self.assertEqual(cached, drawn)
+
+    def test_issue_date_is_part_of_the_key(self):
+        user = User.objects.create(username='siswa')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=user)
+        self.assertNotEqual(certificates.certificate_key(user, course, '1 Januari 2025'),
+                            certificates.certificate_key(user, course, '2 Januari 2025'))
+        job = enqueue_certificate(user, course, date(2025, 1, 2))
+        self.assertEqual(job.issued_on, date(2025, 1, 2))
+        self.assertEqual(job.cache_key, certificates.certificate_key(user, course, '02 January 2025'))
+
+
+class CertificateJobTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(CERTIFICATE_CACHE_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        self.users = [User.objects.create(username=f'siswa{i}') for i in range(3)]
+
+    def test_enqueue_reuses_the_active_job(self):
+        job = enqueue_certificate(self.users[0], self.course)
+        self.assertEqual(enqueue_certificate(self.users[0], self.course).pk, job.pk)
+        CertificateJob.objects.filter(pk=job.pk).update(status='done')
+        self.assertNotEqual(enqueue_certificate(self.users[0], self.course).pk, job.pk)
+
+    def test_claim_hands_out_each_job_once(self):
+        jobs = [enqueue_certificate(user, self.course) for user in self.users]
+        first, second = claim_jobs(2), claim_jobs(2)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(sorted(job.pk for job in first + second), [job.pk for job in jobs])
+        self.assertEqual(claim_jobs(2), [])
+        # Lease habis: worker-nya dianggap mati dan job boleh diambil lagi
+        CertificateJob.objects.filter(pk=jobs[0].pk).update(claimed_at=timezone.now() - LEASE * 2)
+        self.assertEqual([job.pk for job in claim_jobs(2)], [jobs[0].pk])
+
+    @skipUnless(connection.features.has_select_for_update_skip_locked, "butuh SELECT ... FOR UPDATE SKIP LOCKED")
+    def test_claim_skips_locked_rows(self):
+        enqueue_certificate(self.users[0], self.course)
+        with CaptureQueriesContext(connection) as queries:
+            claim_jobs(1)
+        self.assertTrue(any('SKIP LOCKED' in query['sql'] for query in queries.captured_queries))
+
+    def download(self, job):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, user=job.user)
+        return CertificateJobDownloadView.as_view()(request, job_id=job.pk)
+
+    def test_purged_file_is_rendered_again(self):
+        job = enqueue_certificate(self.users[0], self.course)
+        self.assertEqual(run_jobs(claim_jobs(1), workers=0), (1, 0))
+        self.assertEqual(self.download(job).status_code, 200)
+
+        certificates.cache_path(job.cache_key).unlink()
+        self.assertEqual(self.download(job).status_code, 409)
+        self.assertEqual(CertificateJob.objects.get(pk=job.pk).status, 'pending')
+        self.assertEqual(run_jobs(claim_jobs(1), workers=0), (1, 0))
+        self.assertEqual(self.download(job).status_code, 200)
+
+
+class ModerationTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        content = CourseContent.objects.create(course=self.course, name='konten')
+        member = CourseMember.objects.create(course=self.course, user=User.objects.create(username='siswa'))
+        self.comments = [Comment.objects.create(content_id=content, member_id=member, comment=f'komentar {i}')
+                         for i in range(5)]
+        self.moderators = [User.objects.create(username=f'moderator{i}', is_staff=True) for i in range(2)]
+
+    def ids(self, comments):
+        return [comment.pk for comment in comments]
+
+    def approved_counter(self):
+        return CourseStats.objects.get(course=self.course).approved_comments
+
+    def test_claims_are_exclusive(self):
+        first = self.ids(moderation.claim(self.moderators[0], limit=3))
+        second = self.ids(moderation.claim(self.moderators[1], limit=3))
+        self.assertEqual(first, self.ids(self.comments[:3]))
+        self.assertEqual(second, self.ids(self.comments[3:]))
+        self.assertEqual(self.ids(moderation.claim(self.moderators[1], limit=3)), second)
+        # Klaim yang melewati lease boleh diambil moderator lain
+        Comment.objects.filter(pk__in=first).update(claimed_at=timezone.now() - moderation.LEASE * 2)
+        self.assertEqual(self.ids(moderation.claim(self.moderators[1], limit=10)), first + second)
+
+    def test_conditional_update_loses_a_race(self):
+        # Moderator lain mengklaim komentar pertama di antara SELECT dan UPDATE milik claim()
+        original, calls = moderation.claimable, []
+
+        def racing_claimable(moderator, now=None):
+            calls.append(moderator)
+            if len(calls) == 2:
+                Comment.objects.filter(pk=self.comments[0].pk).update(claimed_by=self.moderators[1],
+                                                                      claimed_at=timezone.now())
+            return original(moderator, now)
+
+        with mock.patch.object(moderation, 'claimable', racing_claimable):
+            won = self.ids(moderation.claim(self.moderators[0], limit=2))
+        self.assertEqual(won, self.ids(self.comments[1:2]))
+        self.assertEqual(Comment.objects.get(pk=self.comments[0].pk).claimed_by, self.moderators[1])
+
+    def test_release_frees_claims(self):
+        moderation.claim(self.moderators[0], limit=5)
+        self.assertEqual(moderation.release(self.moderators[1]), 0)
+        self.assertEqual(moderation.release(self.moderators[0], Comment.objects.filter(pk=self.comments[0].pk)), 1)
+        self.assertEqual(self.ids(moderation.claim(self.moderators[1], limit=5)), self.ids(self.comments[:1]))
+
+    def decide(self, view, ids):
+        request = APIRequestFactory().post('/', {'ids': ids}, format='json')
+        force_authenticate(request, user=self.moderators[0])
+        return view.as_view()(request).data
+
+    def test_bulk_approve_and_reject_update_counters(self):
+        moderation.claim(self.moderators[0], limit=5)
+        approved = self.ids(self.comments[:3])
+        self.assertEqual(self.decide(ModerationApproveView, approved), {'updated': 3, 'ids': approved})
+        self.assertEqual(self.approved_counter(), 3)
+        # Sudah disetujui: tidak ada yang berubah lagi
+        self.assertEqual(self.decide(ModerationApproveView, approved)['updated'], 0)
+        self.assertEqual(self.approved_counter(), 3)
+
+        rejected = self.ids(self.comments[2:])
+        self.assertEqual(self.decide(ModerationRejectView, rejected)['updated'], 3)
+        self.assertEqual(self.approved_counter(), 2)
+        self.assertFalse(Comment.objects.filter(claimed_by__isnull=False).exists())
+        self.assertFalse(moderation.pending().exists())
+        self.assertEqual(stats.rebuild(), 1)
+        self.assertEqual(self.approved_counter(), 2)
+
+
+class ValuesSerializerTests(TestCase):
+    def test_matches_drf_output(self):
+        teacher = User.objects.create(username='teacher')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        member = CourseMember.objects.create(course=course, user=teacher)
+        parent = CourseContent.objects.create(course=course, name='bab 1', file_attachment='materi/bab 1.pdf',
+                                              video_url='https://example.com/video')
+        content = CourseContent.objects.create(course=course, name='bab 1.1', parent_id=parent,
+                                               release_time=timezone.now() + timedelta(days=1))
+        ContentCompletion.objects.create(user=teacher, content=content)
+        Comment.objects.create(content_id=content, member_id=member, comment='-', is_approved=True)
+
+        request = APIRequestFactory().get('/')
+        cases = [(CourseContentSerializer, CourseContent.objects.order_by('pk')),
+                 (ContentCompletionSerializer, ContentCompletion.objects.order_by('pk')),
+                 (CommentSerializer, Comment.objects.order_by('pk'))]
+        for zone in ('UTC', 'Asia/Jakarta'):
+            for serializer_class, queryset in cases:
+                with self.subTest(serializer=serializer_class.__name__, zone=zone), timezone.override(zone):
+                    expected = serializer_class(queryset, many=True, context={'request': request}).data
+                    fast = values_serializer(serializer_class).serialize(queryset, request)
+                    self.assertEqual(fast, [dict(row) for row in expected])
+                    self.assertEqual(json.dumps(fast), json.dumps(expected))
+
+
+class CourseContentSerializerTests(TestCase):
+    def test_path_is_not_exposed(self):
+        teacher = User.objects.create(username='teacher')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        data = CourseContentSerializer(CourseContent.objects.create(course=course, name='konten')).data
+        self.assertNotIn('path', data)
+        self.assertEqual(data['name'], 'konten')
+
+
+class TimelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+
+    def test_content_appears_once_released(self):
+        now = timezone.now()
+        later = CourseContent.objects.create(course=self.course, name='bab 2', release_time=now + timedelta(hours=1))
+        first = CourseContent.objects.create(course=self.course, name='bab 1', release_time=now - timedelta(hours=1))
+        with self.assertNumQueries(2):
+            self.assertEqual([row['id'] for row in timeline.released(self.course.id, now)], [first.id])
+        # Timeline masih berlaku: hanya baris yang diambil ulang, jadi perubahan isi langsung terlihat
+        CourseContent.objects.filter(pk=first.pk).update(description='revisi')
+        with self.assertNumQueries(1):
+            rows = timeline.released(self.course.id, now)
+        self.assertEqual(rows[0]['description'], 'revisi')
+
+        rows = timeline.released(self.course.id, now + timedelta(hours=2))
+        self.assertEqual([row['id'] for row in rows], [first.id, later.id])
+        self.assertEqual([row['id'] for row in timeline.released(None, now + timedelta(hours=2))],
+                         [first.id, later.id])
+
+
+class ProgressSignalTests(TestCase):
+    def test_deleting_user_with_completions(self):
+        teacher = User.objects.create(username='teacher')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        content = CourseContent.objects.create(course=course, name='konten')
+        user = User.objects.create(username='siswa')
+        ContentCompletion.objects.create(user=user, content=content)
+        self.assertEqual(CourseProgress.objects.get(user=user).completed, 1)
+        user.delete()
+        self.assertFalse(CourseProgress.objects.exists())
+        self.assertEqual(CourseStats.objects.get(course=course).completions, 0)
+
+
+@override_settings(COMPLETION_SYNC_LAG=0)
+class CompletionSyncTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        self.contents = [CourseContent.objects.create(course=course, name=f'konten {i}') for i in range(3)]
+        self.user = User.objects.create(username='siswa')
+        for content in self.contents:
+            ContentCompletion.objects.create(user=self.user, content=content)
+
+    def sync(self, cursor=None):
+        return completions.changes_page(self.user, cursor=cursor)
+
+    def test_deletions_are_sent_once(self):
+        first = self.sync()
+        self.assertEqual(len(first['results']), 3)
+        self.assertEqual(first['deleted'], [])
+
+        deleted = [content.pk for content in self.contents[:2]]
+        ContentCompletion.objects.get(user=self.user, content=self.contents[0]).delete()
+        # Konten yang dihapus ikut menghapus completion-nya lewat cascade
+        self.contents[1].delete()
+        second = self.sync(first['sync_cursor'])
+        self.assertEqual(second['results'], [])
+        self.assertEqual([row['content_id'] for row in second['deleted']], deleted)
+        self.assertFalse(second['resync'])
+
+        third = self.sync(second['sync_cursor'])
+        self.assertEqual((third['results'], third['deleted']), ([], []))
+
+    def test_page_uses_one_horizon(self):
+        # Horizon halaman dan batas query completion harus sama, kalau tidak baris di antaranya terlewat
+        with mock.patch.object(completions, 'sync_horizon', wraps=completions.sync_horizon) as horizon:
+            self.sync()
+        horizon.assert_called_once()
+
+    def test_old_cursor_must_resync(self):
+        cursor = encode_cursor(timezone.now() - completions.tombstone_retention() - timedelta(days=1), 0)
+        self.assertTrue(self.sync(cursor)['resync'])
+
+    def test_deleting_user_leaves_no_tombstones(self):
+        self.user.delete()
+        self.assertFalse(CompletionTombstone.objects.exists())
+
+
+@override_settings(COMPLETION_SYNC_LAG=0)
+class CompletionBatchTests(TestCase):
+    def setUp(self):
+        teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=teacher)
+        self.contents = [CourseContent.objects.create(course=self.course, name=f'konten {i}') for i in range(3)]
+        self.user = User.objects.create(username='siswa')
+
+    def post(self, content_ids):
+        request = APIRequestFactory().post('/', {'content_ids': content_ids}, format='json')
+        force_authenticate(request, user=self.user)
+        response = CompletionBatchView.as_view()(request)
+        response.render()
+        return response
+
+    def test_mixed_and_duplicate_ids(self):
+        first, second, _ = (content.pk for content in self.contents)
+        ContentCompletion.objects.create(user=self.user, content=self.contents[0])
+        response = self.post([second, first, 999999, second])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data, {'completed': 1, 'results': [
+            {'content': second, 'status': 'completed'},
+            {'content': first, 'status': 'already_completed'},
+            {'content': 999999, 'status': 'not_found'},
+        ]})
+        self.assertEqual(ContentCompletion.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(CourseStats.objects.get(course=self.course).completions, 2)
+        self.assertEqual(CourseProgress.objects.get(user=self.user, course=self.course).completed, 2)
+
+    def test_invalid_body(self):
+        for content_ids in ([], ['satu'], [0]):
+            with self.subTest(content_ids=content_ids):
+                self.assertEqual(self.post(content_ids).status_code, 400)
+        self.assertFalse(ContentCompletion.objects.exists())
+
+    def test_recompleting_after_delete_syncs_tombstone_and_row(self):
+        pk = self.contents[0].pk
+        self.post([pk])
+        first = completions.changes_page(self.user)
+        self.assertEqual([item.content_id for item in first['results']], [pk])
+
+        ContentCompletion.objects.get(user=self.user, content_id=pk).delete()
+        self.assertEqual(self.post([pk]).data['results'], [{'content': pk, 'status': 'completed'}])
+        # Klien menerapkan deleted lebih dulu, lalu results, jadi konten tetap tercatat selesai
+        second = completions.changes_page(self.user, cursor=first['sync_cursor'])
+        self.assertEqual([row['content_id'] for row in second['deleted']], [pk])
+        self.assertEqual([item.content_id for item in second['results']], [pk])
+        self.assertEqual(CourseProgress.objects.get(user=self.user, course=self.course).completed, 1)
+
+
+class CourseProgressExportTests(TestCase):
+    def setUp(self):
+        self.teacher = User.objects.create(username='teacher')
+        self.course = Course.objects.create(name='c', description='-', price=0, teacher=self.teacher)
+        contents = [CourseContent.objects.create(course=self.course, name=f'konten {i}') for i in range(3)]
+        student = User.objects.create(username='siswa')
+        member = CourseMember.objects.create(course=self.course, user=student)
+        for content in contents[:2]:
+            ContentCompletion.objects.create(user=student, content=content)
+        # Koma, kutip, baris baru dan huruf non-ASCII harus lolos utuh di kedua format
+        self.comments = ['biasa', 'koma, "kutip"\nbaris baru — ok']
+        for comment in self.comments:
+            Comment.objects.create(content_id=contents[0], member_id=member, comment=comment, is_approved=True)
+
+    def export(self, fmt, user=None):
+        request = APIRequestFactory().get('/', {'as': fmt})
+        force_authenticate(request, user=user or self.teacher)
+        return CourseProgressExportView.as_view()(request, course_id=self.course.pk)
+
+    def check_headers(self, response, fmt):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], exports.FORMATS[fmt])
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename=progres_course_{self.course.pk}.{fmt}')
+        self.assertEqual(response['X-Accel-Buffering'], 'no')
+
+    def test_ndjson(self):
+        response = self.export('ndjson')
+        self.check_headers(response, 'ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record['type'] for record in records], ['completion'] * 2 + ['comment'] * 2)
+        self.assertEqual(set(records[0]), set(exports.FIELDS))
+        self.assertEqual([record['comment'] for record in records[2:]], self.comments)
+
+    def test_csv(self):
+        response = self.export('csv')
+        self.check_headers(response, 'csv')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode(), newline='')))
+        self.assertEqual(rows[0], exports.FIELDS)
+        self.assertEqual([row[0] for row in rows[1:]], ['completion'] * 2 + ['comment'] * 2)
+        self.assertEqual([row[6] for row in rows[3:]], self.comments)
+
+    def test_row_counts_do_not_depend_on_batching(self):
+        records = list(exports.course_records(self.course.pk, chunk_size=1))
+        self.assertEqual(len(records), 4)
+        ndjson = list(exports.stream_ndjson(iter(records), batch_size=3))
+        self.assertEqual(len(ndjson), 2)
+        self.assertEqual(''.join(ndjson).count('\n'), 4)
+        rows = list(csv.reader(io.StringIO(''.join(exports.stream_csv(iter(records), batch_size=3)), newline='')))
+        self.assertEqual(len(rows), 1 + 4)
+
+    def test_rejects_unknown_format_and_other_users(self):
+        self.assertEqual(self.export('xml').status_code, 400)
+        self.assertEqual(self.export('csv', user=User.objects.get(username='siswa')).status_code, 403)
@@ -0,0 +1,108 @@
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional
+
+from django.core.cache import cache
+
+from lms_core.fastserializers import values_serializer
+from lms_core.models import CourseContent
+from lms_core.serializers import CourseContentSerializer
+
+EPOCH_KEY = "content:timeline:epoch"
+
+# course_id (None = semua course) -> Timeline, disimpan di memori proses ini
+_timelines = {}
+
+
+@dataclass
+class Timeline:
+    version: tuple
+    times: list
+    ids: list
+    # Timestamp release berikutnya yang belum lewat saat timeline dibangun
+    expires: Optional[float]
+
+
+def _version_key(course_id):
+    return f"course:{course_id or 'all'}:timeline:version"
+
+
+def _version(course_id):
+    keys = [EPOCH_KEY, _version_key(course_id)]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return tuple(versions[key] for key in keys)
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate(course_id=None):
+    """
+    Buang timeline ``course_id`` dan timeline semua course.
+
+    Tanpa argumen semua timeline dibuang, misalnya setelah import massal
+    atau saat konten bisa saja pindah course.
+    """
+    if course_id is None:
+        _bump(EPOCH_KEY)
+    else:
+        _bump(_version_key(course_id))
+        _bump(_version_key(None))
+
+
+def contents(course_id=None):
+    """(release_time, id) semua konten ``course_id`` (None = semua course), rilis atau belum, urut."""
+    contents = CourseContent.objects.order_by('release_time', 'id')
+    if course_id is not None:
+        contents = contents.filter(course=course_id)
+    return contents.values_list('release_time', 'id')
+
+
+def rows(ids):
+    """Konten dengan id ``ids``, urut (release_time, id) seperti timeline."""
+    return CourseContent.objects.filter(pk__in=ids).order_by('release_time', 'id')
+
+
+def build(course_id, version):
+    entries = list(contents(course_id))
+    times = [release_time.timestamp() for release_time, _ in entries]
+    now = time.time()
+    index = bisect_right(times, now)
+    expires = times[index] if index < len(times) else None
+    return Timeline(version, times, [pk for _, pk in entries], expires)
+
+
+def released(course_id=None, now=None):
+    """
+    Konten yang sudah rilis, urut (release_time, id), dengan satu query per panggilan.
+
+    Timeline hanya menyimpan (release_time, id) semua konten course;
+    id yang sudah rilis dicari dengan bisect dan barisnya diambil dari
+    database menurut id. Timeline dibangun ulang saat release berikutnya
+    tiba atau saat versinya di cache dinaikkan oleh ``invalidate``.
+    """
+    now = time.time() if now is None else now.timestamp()
+    version = _version(course_id)
+    timeline = _timelines.get(course_id)
+    if timeline is None or timeline.version != version or (timeline.expires is not None
+                                                            and now >= timeline.expires):
+        timeline = _timelines[course_id] = build(course_id, version)
+    ids = timeline.ids[:bisect_right(timeline.times, now)]
+    if not ids:
+        return []
+    return values_serializer(CourseContentSerializer).serialize(rows(ids))
+
+
+def absolute_urls(rows, request):
+    """Salin baris yang punya file_attachment dengan URL absolut untuk ``request``."""
+    return [{**row, 'file_attachment': request.build_absolute_uri(row['file_attachment'])}
+            if row['file_attachment'] else row for row in rows]
@@ -1,5 +1,5 @@
 from django.shortcuts import render, HttpResponse
-from django.http import JsonResponse
+from django.http import JsonResponse, FileResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.core import serializers as django_serializers
 from django.contrib.auth.models import User
 from rest_framework.views import APIView
@@ -8,43 +8,52 @@ from rest_framework import status, serializers
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
-from .models import Comment, Course, CourseMember
-from .serializers import CommentSerializer, RegisterSerializer, CourseContentSerializer, EnrollmentSerializer,ContentCompletion, ContentCompletionSerializer, UserSerializer
+from .models import Comment, Course, CourseMember, CertificateJob
+from .serializers import CommentSerializer, RegisterSerializer, EnrollmentSerializer, BulkEnrollmentSerializer, CompletionBatchSerializer, ModerationClaimSerializer, ModerationIdsSerializer, ContentCompletion, ContentCompletionSerializer, UserSerializer, CertificateJobSerializer
 from lms_core.models import CourseContent
 from django.utils import timezone
-from django.db.models import Count
+from django.db.models.functions import Coalesce
 from django.utils.html import escape
 from django.template.loader import render_to_string
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import cm
-from reportlab.graphics.barcode import qr
-from reportlab.lib.utils import ImageReader
-from reportlab.lib import colors
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
+from django.utils.http import parse_etags
+from django.utils.dateparse import parse_datetime
 from rest_framework.permissions import AllowAny
-
-import io
-import os
+from django.urls import reverse
+from .certificates import cache_path, certificate_key, issue_date, iter_course_certificates, stream_zip
+from .jobs import enqueue_certificate, requeue_if_missing
+from . import analytics, exports, moderation, outline, progress, search, timeline
+from .enrollment import EnrollmentError, enroll
+from .completions import changes_page as completion_changes, completed_by
+from .pagination import InvalidCursor, cursor_response, parse_page_size
+from .planner import optimize
+from .fastserializers import values_serializer
+from .metrics import can_read as can_read_metrics, query_budget, registry as metrics_registry
 
 # --- Public Views ---
 def index(request):
     return HttpResponse("<h1>Hello World</h1>")
 
+def metrics(request):
+    # Daftar route beserta latency dan statistik SQL-nya tidak untuk publik
+    if not can_read_metrics(request):
+        return HttpResponse("Forbidden", status=403, content_type='text/plain')
+    # Format teks Prometheus; angka hanya untuk proses worker yang menjawab request ini
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 def testing(request):
     dataCourse = Course.objects.all()
     data = django_serializers.serialize("python", dataCourse)
     return JsonResponse(data, safe=False)
 
 def addData(request):
-    course = Course(
+    # Nama + pengajar unik (unique_course_name_teacher), jadi panggilan kedua tidak membuat course baru
+    course, created = Course.objects.get_or_create(
         name="Belajar Django",
-        description="Belajar Django dengan Mudah",
-        price=1000000,
-        teacher=User.objects.get(username="admin")
+        teacher=User.objects.get(username="admin"),
+        defaults={"description": "Belajar Django dengan Mudah", "price": 1000000},
     )
-    course.save()
+    if not created:
+        return JsonResponse({"message": "Data sudah ada"})
     return JsonResponse({"message": "Data berhasil ditambahkan"})
 
 def editData(request):
@@ -86,43 +95,94 @@ class CommentCreateView(APIView):
         return Response(serializer.errors, status=400)
 
 
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([IsAdminUser])
 def pending_comments(request):
-    comments = Comment.objects.filter(is_approved=False)
-    serializer = CommentSerializer(comments, many=True)
-    return Response(serializer.data)
+    comments = optimize(moderation.pending(), CommentSerializer)
+    return cursor_response(request, comments, CommentSerializer)
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def approve_comment(request, pk):
-    try:
-        comment = Comment.objects.get(pk=pk)
-        comment.is_approved = True
-        comment.save()
-        return Response({'message': 'Comment approved'})
-    except Comment.DoesNotExist:
+    comments = Comment.objects.filter(pk=pk)
+    if not comments.exists():
         return Response({'error': 'Comment not found'}, status=status.HTTP_404_NOT_FOUND)
+    moderation.approve(comments)
+    return Response({'message': 'Comment approved'})
 
 class CommentApproveView(APIView):
+    """Setujui satu komentar; hanya admin atau pengajar course konten komentarnya."""
     permission_classes = [IsAuthenticated]
 
     def post(self, request, pk):
-        try:
-            comment = Comment.objects.get(pk=pk)
-        except Comment.DoesNotExist:
+        teacher_id = (Comment.objects.filter(pk=pk).values_list('content_id__course__teacher_id', flat=True)
+                      .first())
+        if teacher_id is None:
             return Response({"error": "Comment not found"}, status=404)
-
-        comment.status = "approved"
-        comment.save()
+        if not (request.user.is_staff or request.user.id == teacher_id):
+            return Response({"error": "Hanya admin atau pengajar course yang boleh menyetujui komentar."},
+                            status=status.HTTP_403_FORBIDDEN)
+        moderation.approve(Comment.objects.filter(pk=pk))
         return Response({"message": "Comment approved"})
+
+class ModerationClaimView(APIView):
+    """
+    Klaim batch komentar pending tertua untuk moderator yang login.
+
+    Moderator yang mengklaim bersamaan mendapat komentar berbeda; klaim
+    dilepas saat komentar disetujui/ditolak, lewat ``release/``, atau
+    kedaluwarsa setelah ``moderation.LEASE``.
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(request_body=ModerationClaimSerializer)
+    def post(self, request):
+        serializer = ModerationClaimSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        comments = moderation.claim(request.user, serializer.validated_data['limit'])
+        return Response({"results": CommentSerializer(optimize(comments, CommentSerializer), many=True).data})
+
+class ModerationDecisionView(APIView):
+    """Setujui atau tolak banyak komentar sekaligus dengan satu UPDATE."""
+    permission_classes = [IsAdminUser]
+    decide = None
+
+    @swagger_auto_schema(request_body=ModerationIdsSerializer)
+    def post(self, request):
+        serializer = ModerationIdsSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        changed = self.decide(Comment.objects.filter(pk__in=serializer.validated_data['ids']))
+        return Response({"updated": len(changed), "ids": changed})
+
+class ModerationApproveView(ModerationDecisionView):
+    decide = staticmethod(moderation.approve)
+
+class ModerationRejectView(ModerationDecisionView):
+    decide = staticmethod(moderation.reject)
+
+class ModerationReleaseView(APIView):
+    """Lepas klaim moderator yang login; semua, atau hanya ``ids`` kalau dikirim."""
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(request_body=ModerationIdsSerializer)
+    def post(self, request):
+        comments = None
+        if request.data.get('ids') is not None:
+            serializer = ModerationIdsSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            comments = Comment.objects.filter(pk__in=serializer.validated_data['ids'])
+        return Response({"released": moderation.release(request.user, comments)})
     
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_comments_for_content(request, content_id):
-    comments = Comment.objects.filter(content_id=content_id, is_approved=True)
-    serializer = CommentSerializer(comments, many=True)
-    return Response(serializer.data)
+    comments = optimize(moderation.approved(content_id), CommentSerializer)
+    return cursor_response(request, comments, CommentSerializer)
 
 
 # --- User Registration ---
@@ -135,16 +195,44 @@ class RegisterView(APIView):
 
             course = Course.objects.first()
             if course:
-                CourseMember.objects.create(
-                    user=user,
-                    roles='std'
-                )
+                try:
+                    enroll(user, course, roles='std')
+                except EnrollmentError:
+                    pass
             return Response({"message": "User registered successfully"}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class BulkRegisterView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(request_body=RegisterSerializer(many=True))
+    def post(self, request):
+        serializer = RegisterSerializer(data=request.data, many=True)
+        if serializer.is_valid():
+            users = serializer.save()
+            return Response({"message": f"{len(users)} users registered successfully"}, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 
 # --- Enrollment Views ---
+class BulkEnrollmentView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(request_body=BulkEnrollmentSerializer)
+    def post(self, request):
+        serializer = BulkEnrollmentSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        course = serializer.validated_data['course']
+        if not (request.user.is_staff or course.teacher_id == request.user.id):
+            return Response({"error": "Hanya admin atau pengajar course yang boleh mendaftarkan peserta"},
+                            status=status.HTTP_403_FORBIDDEN)
+        results = serializer.save()
+        enrolled = sum(1 for result in results if result['status'] == 'enrolled')
+        return Response({"course": course.id, "enrolled": enrolled, "results": results})
+
 class EnrollView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -168,71 +256,114 @@ class CourseEnrollmentView(APIView):
 
 class UserActivityDashboardView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 3
 
     def get(self, request):
         user = request.user
-        course_count = CourseMember.objects.filter(user_id=user).count()
-        comment_count = Comment.objects.filter(member_id__user_id=user).count()
+        # Progres dibaca dari CourseProgress dan CourseStats (lihat lms_core/progress.py), bukan COUNT completion
+        courses = list(progress.courses_for(user))
+        for course in courses:
+            course['percent_complete'] = progress.percent(course['completed_contents'], course['total_contents'])
+        comment_count = moderation.written_by(user).count()
         # Tambahkan tracking atau data lain kalau ada
 
         data = {
-            "total_courses_joined": course_count,
+            "total_courses_joined": len(courses),
+            "courses": courses,
             "total_comments": comment_count,
             "user": user.username,
         }
         return Response(data)
 
-class CourseAnalyticsView(APIView):
+class CourseAnalyticsListView(APIView):
+    query_budget = 2
+
     def get(self, request):
-        data = Course.objects.annotate(
-            total_students=Count('coursemember'),
-            total_contents=Count('coursecontent'),
-            total_comments=Count('coursecontent__comment')
-        ).values('id', 'name', 'total_students', 'total_contents', 'total_comments')
+        # Dibaca dari CourseStats (lihat lms_core/stats.py), bukan COUNT lewat join
+        data = Course.objects.order_by('id').values(
+            'id', 'name',
+            total_students=Coalesce('stats__students', 0),
+            total_contents=Coalesce('stats__contents', 0),
+            total_comments=Coalesce('stats__comments', 0),
+            approved_comments=Coalesce('stats__approved_comments', 0),
+            total_completions=Coalesce('stats__completions', 0),
+        )
         return Response(data)    
 
 class CourseAnalyticsView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 3
 
     def get(self, request, course_id):
-        try:
-            course = Course.objects.get(id=course_id)
-        except Course.DoesNotExist:
+        data = analytics.course_analytics(course_id)
+        if data is None:
             return Response({"error": "Course not found"}, status=404)
+        return Response(data)
 
-        total_students = CourseMember.objects.filter(course=course).count()
-        total_contents = CourseContent.objects.filter(course=course).count()
-        total_comments = total_comments = Comment.objects.filter(content_id__course=course).count()
+class AvailableContentView(APIView):
+    query_budget = 2
 
+    def get(self, request):
+        return Response(timeline.absolute_urls(timeline.released(), request))
 
-        # Optional: Rata-rata komentar per konten
-        avg_comments = round(total_comments / total_contents, 2) if total_contents > 0 else 0
+class CourseContentListView(APIView):
+    query_budget = 2
 
-        data = {
-            "course_name": course.name,
-            "total_students": total_students,
-            "total_contents": total_contents,
-            "total_comments": total_comments,
-            "avg_comments_per_content": avg_comments,
-        }
-        return Response(data)
+    def get(self, request, course_id):
+        return Response(timeline.absolute_urls(timeline.released(course_id), request))
+
+class SearchView(APIView):
+    """
+    Cari course dan konten: ``?q=``, opsional ``type=course|content``, ``course=<id>``, ``limit=``.
+
+    ``truncated`` True berarti query cocok dengan terlalu banyak dokumen dan
+    hanya ``SEARCH_RANK_WINDOW`` yang terbaru di-ranking.
+    """
+    query_budget = 3
 
-class AvailableContentView(APIView):
     def get(self, request):
-        now = timezone.now()
-        contents = CourseContent.objects.filter(release_time__lte=now)
-        serializer = CourseContentSerializer(contents, many=True)
-        return Response(serializer.data)
+        params = request.query_params
+        kind = params.get('type') or None
+        if kind is not None and kind not in search.KINDS:
+            return Response({"error": "type harus course atau content"}, status=400)
+        try:
+            course_id = int(params['course']) if params.get('course') else None
+            limit = min(max(int(params.get('limit', 20)), 1), 100)
+        except ValueError:
+            return Response({"error": "course dan limit harus berupa angka"}, status=400)
+        # Staff juga bisa menemukan konten yang belum rilis
+        found = search.search_results(params.get('q', ''), kind=kind, course_id=course_id,
+                                      released_only=not request.user.is_staff, limit=limit)
+        return Response(found)
+
+class CourseOutlineView(APIView):
+    query_budget = 3
 
-class CourseContentListView(APIView):
     def get(self, request, course_id):
-        now = timezone.now()
-        contents = CourseContent.objects.filter(course=course_id, release_time__lte=now)
-        serializer = CourseContentSerializer(contents, many=True)
-        return Response(serializer.data)
+        teacher_id = Course.objects.filter(pk=course_id).values_list('teacher_id', flat=True).first()
+        if teacher_id is None:
+            return Response({"error": "Course not found"}, status=404)
+        # Pengajar dan staff juga melihat konten yang belum rilis
+        user = request.user
+        released_only = not (user.is_staff or user.id == teacher_id)
+        return Response({"course": course_id, "contents": outline.course_outline(course_id, released_only)})
     
     # views.py
 
+def certificate_response(path, key, username):
+    response = FileResponse(open(path, 'rb'), content_type='application/pdf',
+                            as_attachment=True, filename=f'sertifikat_{username}.pdf')
+    response['ETag'] = f'"{key}"'
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def certificate_job_data(request, job):
+    data = CertificateJobSerializer(job).data
+    data['status_url'] = request.build_absolute_uri(reverse('certificate-job', args=[job.id]))
+    if job.status == 'done':
+        data['download_url'] = request.build_absolute_uri(reverse('certificate-job-download', args=[job.id]))
+    return data
+
 class CourseCertificateView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -243,79 +374,85 @@ class CourseCertificateView(APIView):
             return Response({"error": "Course not found"}, status=404)
 
         user = request.user
-        tanggal = timezone.now().strftime('%d %B %Y')
-
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename=sertifikat_{user.username}.pdf'
-
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-
-        # Border emas
-        p.setStrokeColor(colors.gold)
-        p.setLineWidth(5)
-        p.rect(40, 40, width - 80, height - 80)
-
-        # Logo Udinus (ganti path lokal gambar sesuai lokasi logo kamu)
-        logo_path = os.path.join('static', 'image.png') 
-        if os.path.exists(logo_path):
-            logo = ImageReader(logo_path)
-            p.drawImage(logo, width / 2 - 50, height - 130, width=80, height=80, mask='auto')
-
-        # Judul
-        p.setFont("Helvetica-Bold", 28)
-        p.setFillColor(colors.darkblue)
-        p.drawCentredString(width / 2, height - 170, "SERTIFIKAT PENYELESAIAN")
-
-        # Konten utama
-        p.setFont("Helvetica", 14)
-        p.setFillColor(colors.black)
-        p.drawCentredString(width / 2, height - 210, "Dengan ini menyatakan bahwa")
-
-        p.setFont("Helvetica-Bold", 22)
-        p.drawCentredString(width / 2, height - 240, user.username)
-
-        p.setFont("Helvetica", 14)
-        p.drawCentredString(width / 2, height - 270, "telah berhasil menyelesaikan kursus:")
-
-        p.setFont("Helvetica-Bold", 18)
-        p.drawCentredString(width / 2, height - 300, course.name)
-
-        p.setFont("Helvetica-Oblique", 12)
-        p.drawCentredString(width / 2, height - 320, course.description)
-
-        # Tanggal
-        p.setFont("Helvetica", 12)
-        p.drawRightString(width - 60, 165, f"Semarang, {tanggal}")
+        today = timezone.localdate()
+        key = certificate_key(user, course, issue_date(today))
+        if f'"{key}"' in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = f'"{key}"'
+            return response
+
+        path = cache_path(key)
+        if path.exists():
+            return certificate_response(path, key, user.username)
+
+        # Belum ada di cache: render di worker (manage.py certificate_worker)
+        job = enqueue_certificate(user, course, today)
+        return Response(certificate_job_data(request, job), status=status.HTTP_202_ACCEPTED)
+
+class CourseProgressExportView(APIView):
+    """Semua completion dan komentar satu course, dikirim baris per baris: ``?as=ndjson`` (default) atau ``?as=csv``."""
+    permission_classes = [IsAuthenticated]
 
-        # Tanda tangan
-        p.setFont("Helvetica", 12)
-        p.drawString(60, 100, "Admin LMS")
+    def get(self, request, course_id):
+        fmt = request.query_params.get('as', 'ndjson')
+        if fmt not in exports.FORMATS:
+            return Response({"error": f"Format harus salah satu dari: {', '.join(exports.FORMATS)}"}, status=400)
+        teacher_id = Course.objects.filter(pk=course_id).values_list('teacher_id', flat=True).first()
+        if teacher_id is None:
+            return Response({"error": "Course not found"}, status=404)
+        if not (request.user.is_staff or request.user.id == teacher_id):
+            return Response({"error": "Hanya admin atau pengajar course yang boleh mengekspor progres"},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        records = exports.course_records(course_id)
+        response = StreamingHttpResponse(exports.STREAMS[fmt](records), content_type=exports.FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename=progres_course_{course_id}.{fmt}'
+        # Supaya proxy (nginx) tidak menahan response sampai selesai
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
-        p.setFont("Helvetica", 12)
-        p.drawString(60, 80, "(AKMAL ZULFIKAR)")
+class CertificateJobView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        # QR Code
-        qr_code = qr.QrCodeWidget('https://udinus.ac.id/verify/123456')
-        qr_bounds = qr_code.getBounds()  # (x1, y1, x2, y2)
-        width = qr_bounds[2] - qr_bounds[0]
-        height = qr_bounds[3] - qr_bounds[1]
-        qr_drawing = Drawing(width, height)
-        qr_drawing.add(qr_code)
-        qr_x = 420  # posisi dari kiri
-        qr_y = 70
-        renderPDF.draw(qr_drawing, p, qr_x, qr_y)
+    def get(self, request, job_id):
+        try:
+            job = CertificateJob.objects.get(id=job_id, user=request.user)
+        except CertificateJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=404)
+        return Response(certificate_job_data(request, requeue_if_missing(job)))
 
+class CertificateJobDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
 
+    def get(self, request, job_id):
+        try:
+            job = CertificateJob.objects.get(id=job_id, user=request.user)
+        except CertificateJob.DoesNotExist:
+            return Response({"error": "Job not found"}, status=404)
+
+        # File yang sudah dibersihkan dari cache dirender ulang; client memantau status_url lagi
+        job = requeue_if_missing(job)
+        path = cache_path(job.cache_key)
+        if job.status != 'done' or not path.exists():
+            return Response(certificate_job_data(request, job), status=status.HTTP_409_CONFLICT)
+        if f'"{job.cache_key}"' in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = f'"{job.cache_key}"'
+            return response
+        return certificate_response(path, job.cache_key, request.user.username)
+
+class CourseCertificateBatchView(APIView):
+    permission_classes = [IsAdminUser]
 
-        # Finishing
-        p.showPage()
-        p.save()
-        pdf = buffer.getvalue()
-        buffer.close()
+    def get(self, request, course_id):
+        try:
+            course = Course.objects.get(id=course_id)
+        except Course.DoesNotExist:
+            return Response({"error": "Course not found"}, status=404)
 
-        response.write(pdf)
+        files = iter_course_certificates(course, issue_date())
+        response = StreamingHttpResponse(stream_zip(files), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename=sertifikat_course_{course.id}.zip'
         return response
     
 class MarkContentCompleteView(APIView):
@@ -347,12 +484,55 @@ class MarkContentCompleteView(APIView):
 
 class UserCompletedContentView(APIView):
     permission_classes = [IsAuthenticated]
+    query_budget = 2
 
     def get(self, request):
         user = request.user
-        completions = ContentCompletion.objects.filter(user=user)
-        serializer = ContentCompletionSerializer(completions, many=True)
-        return Response(serializer.data)
+        completions = completed_by(user)
+        return Response(values_serializer(ContentCompletionSerializer).serialize(completions, request))
+
+class CompletionBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(request_body=CompletionBatchSerializer)
+    def post(self, request):
+        serializer = CompletionBatchSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        results = serializer.save()
+        completed = sum(1 for result in results if result['status'] == 'completed')
+        return Response({"completed": completed, "results": results})
+
+class CompletionChangesView(APIView):
+    """
+    Completion user sejak ``?since=<ISO 8601>`` atau ``?cursor=``, terurut (completed_at, id).
+
+    ``deleted`` berisi completion yang dihapus di rentang yang sama;
+    terapkan sebelum ``results``. Simpan ``sync_cursor`` dan kirim lagi
+    sebagai ``cursor`` saat sync berikutnya. ``resync`` berarti titik
+    sync terlalu lama dan klien harus mengambil ulang semuanya.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 3
+
+    def get(self, request):
+        since, cursor = request.query_params.get('since'), request.query_params.get('cursor')
+        try:
+            since = parse_datetime(since) if since else None
+        except ValueError:
+            since = None
+        if request.query_params.get('since') and since is None:
+            return Response({'error': "since harus berupa tanggal ISO 8601."}, status=status.HTTP_400_BAD_REQUEST)
+        if since is not None and timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        try:
+            page_size = parse_page_size(request.query_params.get('page_size'))
+            page = completion_changes(request.user, since, cursor, page_size)
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        page['results'] = ContentCompletionSerializer(page['results'], many=True).data
+        page['deleted'] = [{'content': row['content_id'], 'deleted_at': row['deleted_at']} for row in page['deleted']]
+        return Response(page)
 
 class UserProfileView(APIView):
     permission_classes = [IsAuthenticated]
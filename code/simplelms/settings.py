@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'lms_core.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -116,11 +118,48 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Cache
+# Dipakai untuk analytics course (lms_core/analytics.py). Kalau server jalan
+# dengan banyak proses, ganti ke django.core.cache.backends.redis.RedisCache
+# (service redis di docker-compose) supaya invalidasi berlaku di semua proses.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+
+# Pagination cursor (lihat lms_core/pagination.py); ?page_size= dibatasi maksimum ini
+CURSOR_PAGE_SIZE = 50
+CURSOR_MAX_PAGE_SIZE = 200
+
+# Sync completion (lihat lms_core/completions.py): completion yang lebih muda dari ini belum dikirim
+COMPLETION_SYNC_LAG = 5
+# Tombstone completion yang dihapus disimpan sekian hari; cursor yang lebih tua harus sync ulang
+COMPLETION_TOMBSTONE_DAYS = 30
+
+
+# Metrics per route di /metrics (lihat lms_core/middleware.py). Dengan strict,
+# request yang melewati @query_budget view-nya langsung gagal, bukan hanya di-log.
+QUERY_BUDGET_STRICT = False
+
+# Pencarian (lihat lms_core/search.py): kalau dokumen yang cocok lebih dari ini, hanya yang terbaru
+# yang di-ranking dan respons ditandai truncated. None = selalu ranking semua
+SEARCH_RANK_WINDOW = 100_000
+
+# /metrics hanya untuk staff yang login, atau scraper yang mengirim "Authorization: Bearer <token>"
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
 
+# Cache PDF sertifikat (lihat lms_core/certificates.py)
+CERTIFICATE_CACHE_DIR = BASE_DIR / 'cache' / 'certificates'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -16,7 +16,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from lms_core.views import index, testing, addData, editData, deleteData, RegisterView, pending_comments, approve_comment, CommentApproveView, UserActivityDashboardView, AvailableContentView, CourseAnalyticsView, MarkContentCompleteView,UserCompletedContentView, UserProfileView
+from lms_core.views import index, metrics, testing, addData, editData, deleteData, RegisterView, BulkRegisterView, pending_comments, approve_comment, get_comments_for_content, CommentApproveView, ModerationClaimView, ModerationApproveView, ModerationRejectView, ModerationReleaseView, UserActivityDashboardView, AvailableContentView, CourseOutlineView, SearchView, CourseAnalyticsView, CourseAnalyticsListView, MarkContentCompleteView,UserCompletedContentView, CompletionBatchView, CompletionChangesView, UserProfileView
 from lms_core.views import CommentCreateView
 from lms_core.api import apiv1
 from rest_framework_simplejwt.views import (
@@ -26,7 +26,7 @@ from rest_framework_simplejwt.views import (
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
-from lms_core.views import CourseEnrollmentView, EnrollView,CourseCertificateView
+from lms_core.views import CourseEnrollmentView, BulkEnrollmentView, EnrollView,CourseCertificateView, CourseCertificateBatchView, CourseProgressExportView, CertificateJobView, CertificateJobDownloadView
 
 
 schema_view = get_schema_view(
@@ -48,21 +48,38 @@ urlpatterns = [
     path('ubah/', editData),
     path('hapus/', deleteData),
     path('', index),
+    path('metrics', metrics, name='metrics'),
     path('api/register/', RegisterView.as_view(), name='register'),
+    path('api/register/bulk/', BulkRegisterView.as_view(), name='register-bulk'),
     path('api/comments/pending/', pending_comments),
+    path('api/contents/<int:content_id>/comments/', get_comments_for_content, name='content-comments'),
     path('api/comments/<int:pk>/approve/',CommentApproveView.as_view(), name='comment-approve'),
+    path('api/comments/moderation/claim/', ModerationClaimView.as_view(), name='moderation-claim'),
+    path('api/comments/moderation/approve/', ModerationApproveView.as_view(), name='moderation-approve'),
+    path('api/comments/moderation/reject/', ModerationRejectView.as_view(), name='moderation-reject'),
+    path('api/comments/moderation/release/', ModerationReleaseView.as_view(), name='moderation-release'),
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('api/enroll/', CourseEnrollmentView.as_view(), name='course-enroll'),
+    path('api/enroll/bulk/', BulkEnrollmentView.as_view(), name='course-enroll-bulk'),
     # path('api/enroll/', EnrollView.as_view(), name='enroll__create'),
     path("dashboard/user-activity/", UserActivityDashboardView.as_view(), name="user_activity_dashboard"),
     path('available-content/', AvailableContentView.as_view(), name='available-content'),
+    path('api/search/', SearchView.as_view(), name='search'),
+    path("course/analytics/", CourseAnalyticsListView.as_view(), name="course-analytics-list"),
     path("course/<int:course_id>/analytics/", CourseAnalyticsView.as_view(), name="course-analytics"),
+    path("course/<int:course_id>/outline/", CourseOutlineView.as_view(), name="course-outline"),
     path('courses/<int:course_id>/certificate/', CourseCertificateView.as_view(), name='course-certificate'),
+    path('courses/<int:course_id>/certificates/', CourseCertificateBatchView.as_view(), name='course-certificate-batch'),
+    path('courses/<int:course_id>/export/', CourseProgressExportView.as_view(), name='course-progress-export'),
+    path('certificates/jobs/<int:job_id>/', CertificateJobView.as_view(), name='certificate-job'),
+    path('certificates/jobs/<int:job_id>/download/', CertificateJobDownloadView.as_view(), name='certificate-job-download'),
     path('content/<int:content_id>/complete/', MarkContentCompleteView.as_view()),
     path('content/completed/', UserCompletedContentView.as_view()),
+    path('content/completed/batch/', CompletionBatchView.as_view(), name='completion-batch'),
+    path('content/completed/changes/', CompletionChangesView.as_view(), name='completion-changes'),
     path('me/', UserProfileView.as_view()),
     path('comments/', CommentCreateView.as_view(), name='create_comment'),
 